@@ -2,6 +2,8 @@
 
 import sys
 import os
+import logging
+import orjson
 import structlog
 from dotenv import load_dotenv
 
@@ -22,13 +24,20 @@ def setup_logging():
     ]
     
     if settings.log_format == "json":
-        processors.append(structlog.processors.JSONRenderer())
+        # orjson renders log events several times faster than stdlib json.
+        processors.append(structlog.processors.JSONRenderer(
+            serializer=lambda obj, **kw: orjson.dumps(obj, default=str).decode()
+        ))
     else:
         processors.append(structlog.dev.ConsoleRenderer())
-    
+
+    # The filtering bound logger turns below-level calls (e.g. the debug
+    # logging on cache hot paths) into no-ops before kwargs are assembled.
+    level = getattr(logging, settings.log_level.upper(), logging.INFO)
+
     structlog.configure(
         processors=processors,
-        wrapper_class=structlog.stdlib.BoundLogger,
+        wrapper_class=structlog.make_filtering_bound_logger(level),
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
         cache_logger_on_first_use=True,
@@ -1,21 +1,24 @@
 """Authentication and authorization for HTTP mode."""
 
+import hashlib
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, TYPE_CHECKING
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
+from cachetools import TTLCache
 from fastapi import HTTPException, Security, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import structlog
 
-from .config import Settings
+from .config import Settings, get_settings
 
 if TYPE_CHECKING:
     from .oauth import OAuthManager
 
 logger = structlog.get_logger()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
 
@@ -24,12 +27,27 @@ class AuthManager:
     
     def __init__(self, settings: Settings, oauth_manager: Optional['OAuthManager'] = None):
         self.settings = settings
-        self.valid_api_keys = set(settings.get_api_keys())
+        # API keys are kept as BLAKE2b-128 digests: membership stays O(1)
+        # and comparing fixed-length hashes leaks no timing signal about
+        # the configured keys.
+        self._api_key_hashes = frozenset(
+            hashlib.blake2b(key.encode(), digest_size=16).digest()
+            for key in settings.api_key_set
+        )
         self.oauth_manager = oauth_manager
+        # Verified JWT payloads keyed by a BLAKE2b-128 of the raw token, so
+        # repeat requests skip the HMAC verification entirely. TTL stays short
+        # so a cached payload can never outlive its own "exp" by much.
+        self._token_cache: TTLCache = TTLCache(
+            maxsize=settings.token_cache_size,
+            ttl=min(30, settings.access_token_expire_minutes * 60)
+        )
+        self._token_cache_lock = threading.Lock()
     
     def verify_api_key(self, api_key: str) -> bool:
         """Verify if the API key is valid."""
-        return api_key in self.valid_api_keys
+        digest = hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+        return digest in self._api_key_hashes
     
     def create_access_token(
         self,
@@ -56,14 +74,23 @@ class AuthManager:
     
     def verify_token(self, token: str) -> dict:
         """Verify and decode a JWT token."""
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+        with self._token_cache_lock:
+            cached = self._token_cache.get(cache_key)
+        if cached is not None and cached.get("exp", 0) > time.time():
+            return cached
+
         try:
             payload = jwt.decode(
                 token,
                 self.settings.secret_key,
                 algorithms=[self.settings.algorithm]
             )
+            with self._token_cache_lock:
+                self._token_cache[cache_key] = payload
             return payload
-        except JWTError as e:
+        except jwt.PyJWTError as e:
             logger.error("token_verification_failed", error=str(e))
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -88,7 +115,17 @@ class AuthManager:
             logger.info("oauth_authenticated", token=token[:10] + "...")
             return {"auth_type": "oauth", "token": token}
         
-        # Try JWT token
+        # Try JWT token. A JWT always has exactly two dots; skipping
+        # jwt.decode for anything else avoids pointless base64/crypto work
+        # on garbage or mistyped API keys.
+        if token.count(".") != 2:
+            logger.warning("authentication_failed")
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
         try:
             payload = self.verify_token(token)
             logger.info("jwt_authenticated", subject=payload.get("sub"))
@@ -103,10 +140,11 @@ class AuthManager:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
-    return pwd_context.hash(password)
+    """Hash a password with bcrypt."""
+    salt = bcrypt.gensalt(rounds=get_settings().bcrypt_rounds)
+    return bcrypt.hashpw(password.encode(), salt).decode()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against a bcrypt hash."""
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
@@ -1,69 +1,202 @@
 """Caching layer for Odoo data."""
 
-import json
+import threading
+from collections import defaultdict
+
+import msgpack
+import orjson
 from typing import Optional, Any
+from cachetools import TTLCache
 import structlog
 
 logger = structlog.get_logger()
 
+# Redis values are stored as msgpack with a one-byte version prefix so
+# legacy orjson entries written before the format change still deserialize.
+_MSGPACK_PREFIX = b"\x01"
+
+
+def _serialize(value: Any) -> bytes:
+    """Serialize a value for Redis storage."""
+    return _MSGPACK_PREFIX + msgpack.packb(value, use_bin_type=True, default=str)
+
+
+def _deserialize(raw: bytes) -> Any:
+    """Deserialize a Redis value, accepting legacy JSON entries."""
+    if raw[:1] == _MSGPACK_PREFIX:
+        return msgpack.unpackb(raw[1:], raw=False)
+    return orjson.loads(raw)
+
+
+def create_redis_client(settings) -> Optional[Any]:
+    """Create a pooled async Redis client, or None if Redis is disabled."""
+    if not settings.redis_enabled:
+        return None
+
+    import redis.asyncio as redis
+
+    # decode_responses stays off so raw bytes flow straight into the decoder.
+    return redis.from_url(
+        settings.redis_url,
+        max_connections=64,
+        decode_responses=False
+    )
+
 
 class CacheManager:
     """Manages caching with optional Redis backend."""
-    
-    def __init__(self, redis_client=None, ttl: int = 300):
+
+    def __init__(self, redis_client=None, ttl: int = 300, maxsize: int = 10_000):
         self.redis_client = redis_client
         self.ttl = ttl
-        self.local_cache = {}
+        # Bounded in-process cache: entries expire after `ttl` seconds and the
+        # least-recently-used ones are evicted once `maxsize` is reached.
+        # TTLCache is not thread-safe, so mutations are guarded by a lock.
+        self.local_cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._local_lock = threading.RLock()
+        # Group invalidation works by generation counter, not by key sets:
+        # tagged keys embed their tag's current generation, so bumping the
+        # counter strands every older entry (they age out via TTL/LRU).
+        # Unlike a tag->keys index, this stays bounded no matter how many
+        # distinct keys a tag accumulates.
+        self._local_gens: defaultdict = defaultdict(int)
+        # Short-lived memo of Redis generation counters so tagged reads
+        # don't pay a second round-trip per get; worst case an invalidation
+        # from another worker takes effect here up to 1s late.
+        self._gen_cache: TTLCache = TTLCache(maxsize=1024, ttl=1.0)
     
     def _make_key(self, prefix: str, *args) -> str:
         """Create a cache key."""
         parts = [prefix] + [str(arg) for arg in args]
         return ":".join(parts)
-    
-    async def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
+
+    async def _versioned(self, key: str, tag: str) -> str:
+        """Embed the tag's current generation in the key."""
+        if self.redis_client:
+            gen = self._gen_cache.get(tag)
+            if gen is None:
+                raw = await self.redis_client.get(f"cache:gen:{tag}")
+                gen = int(raw) if raw else 0
+                self._gen_cache[tag] = gen
+        else:
+            gen = self._local_gens[tag]
+        return f"{key}:g{gen}"
+
+    async def get(self, key: str, tag: Optional[str] = None) -> Optional[Any]:
+        """Get value from cache; pass the same `tag` the entry was set with."""
         try:
+            if tag is not None:
+                key = await self._versioned(key, tag)
             if self.redis_client:
                 value = await self.redis_client.get(key)
                 if value:
                     logger.debug("cache_hit_redis", key=key)
-                    return json.loads(value)
+                    return _deserialize(value)
             else:
-                if key in self.local_cache:
-                    logger.debug("cache_hit_local", key=key)
-                    return self.local_cache[key]
-            
+                with self._local_lock:
+                    try:
+                        value = self.local_cache[key]
+                        logger.debug("cache_hit_local", key=key)
+                        return value
+                    except KeyError:
+                        pass
+
             logger.debug("cache_miss", key=key)
             return None
         except Exception as e:
             logger.error("cache_get_error", key=key, error=str(e))
             return None
     
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Set value in cache."""
+    async def set(
+        self, key: str, value: Any, ttl: Optional[int] = None, tag: Optional[str] = None
+    ) -> bool:
+        """Set value in cache, versioned under `tag` for group invalidation
+        via invalidate_tag()."""
         try:
             ttl = ttl or self.ttl
-            
+            if tag is not None:
+                key = await self._versioned(key, tag)
+
             if self.redis_client:
-                serialized = json.dumps(value)
+                serialized = _serialize(value)
                 await self.redis_client.setex(key, ttl, serialized)
                 logger.debug("cache_set_redis", key=key, ttl=ttl)
             else:
-                self.local_cache[key] = value
+                with self._local_lock:
+                    self.local_cache[key] = value
                 logger.debug("cache_set_local", key=key)
-            
+
             return True
         except Exception as e:
             logger.error("cache_set_error", key=key, error=str(e))
             return False
+
+    async def invalidate_tag(self, tag: str) -> bool:
+        """Strand every cached entry versioned under `tag`.
+
+        Bumping the generation makes old keys unreachable immediately
+        (within the 1s gen-memo window on other workers); the stranded
+        entries themselves age out through their own TTL/LRU bounds, so
+        no key enumeration or index is needed.
+        """
+        try:
+            if self.redis_client:
+                await self.redis_client.incr(f"cache:gen:{tag}")
+                self._gen_cache.pop(tag, None)
+            else:
+                with self._local_lock:
+                    self._local_gens[tag] += 1
+            logger.debug("cache_tag_invalidated", tag=tag)
+            return True
+        except Exception as e:
+            logger.error("cache_invalidate_error", tag=tag, error=str(e))
+            return False
     
+    async def mget(self, keys: list) -> list:
+        """Get multiple values in one round-trip. Returns None for misses."""
+        if not keys:
+            return []
+        try:
+            if self.redis_client:
+                values = await self.redis_client.mget(keys)
+                return [_deserialize(v) if v is not None else None for v in values]
+
+            with self._local_lock:
+                return [self.local_cache.get(key) for key in keys]
+        except Exception as e:
+            logger.error("cache_mget_error", count=len(keys), error=str(e))
+            return [None] * len(keys)
+
+    async def mset(self, mapping: dict, ttl: Optional[int] = None) -> bool:
+        """Set multiple values; one pipelined round-trip on Redis."""
+        try:
+            ttl = ttl or self.ttl
+
+            if self.redis_client:
+                pipe = self.redis_client.pipeline(transaction=False)
+                for key, value in mapping.items():
+                    pipe.setex(key, ttl, _serialize(value))
+                await pipe.execute()
+                logger.debug("cache_mset_redis", count=len(mapping), ttl=ttl)
+            else:
+                with self._local_lock:
+                    for key, value in mapping.items():
+                        self.local_cache[key] = value
+                logger.debug("cache_mset_local", count=len(mapping))
+
+            return True
+        except Exception as e:
+            logger.error("cache_mset_error", count=len(mapping), error=str(e))
+            return False
+
     async def delete(self, key: str) -> bool:
         """Delete key from cache."""
         try:
             if self.redis_client:
                 await self.redis_client.delete(key)
             else:
-                self.local_cache.pop(key, None)
+                with self._local_lock:
+                    self.local_cache.pop(key, None)
             
             logger.debug("cache_delete", key=key)
             return True
@@ -71,13 +204,23 @@ class CacheManager:
             logger.error("cache_delete_error", key=key, error=str(e))
             return False
     
+    async def close(self) -> None:
+        """Close the Redis connection pool if one is attached."""
+        if self.redis_client:
+            try:
+                await self.redis_client.aclose()
+                logger.info("cache_closed")
+            except Exception as e:
+                logger.error("cache_close_error", error=str(e))
+
     async def clear(self) -> bool:
         """Clear all cache."""
         try:
             if self.redis_client:
                 await self.redis_client.flushdb()
             else:
-                self.local_cache.clear()
+                with self._local_lock:
+                    self.local_cache.clear()
             
             logger.info("cache_cleared")
             return True
@@ -1,6 +1,7 @@
 """Configuration management for MCP Odoo Server."""
 
 import os
+from functools import cached_property, lru_cache
 from typing import List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -14,11 +15,24 @@ class Settings(BaseSettings):
     odoo_username: str = Field(default="", description="Odoo username")
     odoo_password: str = Field(default="", description="Odoo password")
     odoo_timeout: int = Field(default=30, description="Odoo API timeout in seconds")
+    odoo_transport: str = Field(
+        default="xmlrpc",
+        description="Odoo RPC transport: 'xmlrpc' or 'jsonrpc'"
+    )
     odoo_max_retries: int = Field(default=3, description="Max retries for Odoo API calls")
+    odoo_max_concurrency: int = Field(
+        default=16,
+        description="Max concurrent RPC calls against Odoo per worker"
+    )
     
     server_mode: str = Field(default="http", description="Server mode: http or stdio")
     host: str = Field(default="0.0.0.0", description="Host to bind to (HTTP mode)")
     port: int = Field(default=5000, description="Port to bind to (HTTP mode)")
+    workers: int = Field(
+        default=1,
+        description="Number of uvicorn worker processes (enable Redis when > 1, "
+                    "since the in-process cache and OAuth state are per worker)"
+    )
     server_url: str = Field(
         default="",
         description="Public server URL for OAuth redirects (auto-detected from REPLIT_DOMAINS or use custom)"
@@ -34,27 +48,58 @@ class Settings(BaseSettings):
         description="Access token expiration in minutes"
     )
     
-    api_keys: str = Field(default="", description="Comma-separated list of API keys")
+    api_keys: str = Field(
+        default="",
+        description="Comma-separated list of API keys (keys must not contain two dots, "
+                    "which is reserved for JWT detection)"
+    )
+    token_cache_size: int = Field(
+        default=1024,
+        description="Max entries in the JWT verification cache"
+    )
+    bcrypt_rounds: int = Field(default=12, description="bcrypt work factor for password hashing")
     
     redis_enabled: bool = Field(default=False, description="Enable Redis cache")
     redis_url: str = Field(default="redis://localhost:6379/0", description="Redis URL")
     cache_ttl: int = Field(default=300, description="Cache TTL in seconds")
+    local_cache_max: int = Field(
+        default=10_000,
+        description="Max entries in the in-process cache"
+    )
     
     log_level: str = Field(default="INFO", description="Logging level")
     log_format: str = Field(default="json", description="Log format: json or console")
     
     rate_limit: int = Field(default=60, description="Rate limit per minute")
+    allowed_origins: str = Field(
+        default="https://chat.openai.com,https://chatgpt.com",
+        description="Comma-separated CORS origin allow-list ('*' allows any origin "
+                    "but disables credentials)"
+    )
+    expose_oauth_credentials: bool = Field(
+        default=True,
+        description="Register the /oauth/credentials setup endpoint (disable in production)"
+    )
     
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
         case_sensitive = False
     
+    @cached_property
+    def api_key_set(self) -> frozenset:
+        """Parsed API keys, computed once per Settings instance."""
+        if not self.api_keys:
+            return frozenset()
+        return frozenset(key.strip() for key in self.api_keys.split(",") if key.strip())
+
     def get_api_keys(self) -> List[str]:
         """Parse and return API keys as a list."""
-        if not self.api_keys:
-            return []
-        return [key.strip() for key in self.api_keys.split(",") if key.strip()]
+        return list(self.api_key_set)
+
+    def get_allowed_origins(self) -> List[str]:
+        """Parse and return the CORS origin allow-list."""
+        return [origin.strip() for origin in self.allowed_origins.split(",") if origin.strip()]
     
     def get_server_url(self) -> str:
         """Get the public server URL, auto-detecting from Replit if available."""
@@ -72,6 +117,7 @@ class Settings(BaseSettings):
         return f"http://localhost:{self.port}"
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings."""
+    """Get application settings (parsed once per process)."""
     return Settings()
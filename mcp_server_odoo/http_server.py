@@ -1,42 +1,169 @@
 """HTTP server implementation with FastAPI for N8N, ChatGPT, and web agents."""
 
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import sys
+from time import monotonic
+from urllib.parse import urlencode
+from contextlib import asynccontextmanager
 from datetime import timedelta
-from typing import Optional
+import orjson
+from cachetools import TTLCache
+from typing import Any, Optional
 from fastapi import FastAPI, HTTPException, Depends, status, Request, Form
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, Response, RedirectResponse, HTMLResponse
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from pydantic import BaseModel
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi.responses import (
+    ORJSONResponse,
+    Response,
+    RedirectResponse,
+    HTMLResponse,
+    StreamingResponse,
+)
+from jinja2 import Template
+from pydantic import BaseModel, ConfigDict
+from starlette.types import ASGIApp, Receive, Scope, Send
 import structlog
 import uvicorn
 
 from .config import get_settings, Settings
 from .auth import AuthManager
 from .odoo_client import OdooClient
-from .cache import CacheManager
-from .tools import get_tools, handle_tool_call
-from .mcp_tools import mcp
+from .cache import CacheManager, create_redis_client
+from .tools import get_tools_json_bytes, handle_tool_call
+from .mcp_tools import mcp, close_odoo_client
 from .oauth import oauth_manager
 
 logger = structlog.get_logger()
 
+# Tool results above this size are streamed in chunks instead of handed to
+# the response encoder as one allocation.
+LARGE_RESULT_THRESHOLD = 64 * 1024
+
+
+def _stream_text_json(prefix: bytes, text: str, suffix: bytes, size: int = 64 * 1024):
+    """Stream a JSON envelope whose only variable part is a large string.
+
+    Yields the static prefix, then the text JSON-escaped in windows (escapes
+    never span characters, so per-window encoding concatenates cleanly), then
+    the closing suffix — the multi-MB body is never materialized at once.
+    """
+    yield prefix
+    for i in range(0, len(text), size):
+        yield orjson.dumps(text[i:i + size])[1:-1]
+    yield suffix
+
+
+# Compiled once at import; autoescape also keeps client-supplied values
+# (client_name, redirect_uri, state) from being injected into the page.
+CONSENT_PAGE = Template("""\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Authorize Access</title>
+    <style>
+        body { font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
+               display: flex; justify-content: center; align-items: center;
+               min-height: 100vh; margin: 0; background: #f5f5f5; }
+        .container { background: white; padding: 2rem; border-radius: 8px;
+                     box-shadow: 0 2px 10px rgba(0,0,0,0.1); max-width: 400px; }
+        h1 { margin: 0 0 1rem; color: #333; }
+        .client-name { color: #0066cc; font-weight: 600; }
+        .scopes { background: #f8f9fa; padding: 1rem; border-radius: 4px; margin: 1rem 0; }
+        .scope-item { margin: 0.5rem 0; }
+        button { width: 100%; padding: 0.75rem; border: none; border-radius: 4px;
+                 font-size: 1rem; cursor: pointer; font-weight: 600; }
+        .authorize { background: #0066cc; color: white; margin-bottom: 0.5rem; }
+        .authorize:hover { background: #0052a3; }
+        .deny { background: #e0e0e0; color: #666; }
+        .deny:hover { background: #d0d0d0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Authorize Access</h1>
+        <p><span class="client-name">{{ client_name }}</span> wants to access your Odoo data.</p>
+
+        <div class="scopes">
+            <strong>Permissions requested:</strong>
+            <div class="scope-item">✓ Read Odoo data</div>
+            <div class="scope-item">✓ Write Odoo data</div>
+        </div>
+
+        <form method="post" action="/oauth/authorize/approve">
+            <input type="hidden" name="client_id" value="{{ client_id }}">
+            <input type="hidden" name="redirect_uri" value="{{ redirect_uri }}">
+            <input type="hidden" name="state" value="{{ state }}">
+            <input type="hidden" name="scope" value="{{ scope }}">
+            <button type="submit" class="authorize">Authorize</button>
+        </form>
+
+        <button class="deny" onclick="window.location.href='{{ deny_url }}'">
+            Deny
+        </button>
+    </div>
+</body>
+</html>
+""", autoescape=True)
+
+
+def _parse_basic(auth_header: Optional[str]) -> Optional[tuple]:
+    """Parse an `Authorization: Basic ...` header into (username, password).
+
+    Cheaper than the HTTPBasic dependency: no security-chain objects are
+    built for the (common) form-auth requests that carry no such header.
+    """
+    if not auth_header or not auth_header.startswith("Basic "):
+        return None
+    try:
+        decoded = base64.b64decode(auth_header[6:]).decode("utf-8")
+        username, _, password = decoded.partition(":")
+        return username, password
+    except (binascii.Error, UnicodeDecodeError):
+        return None
+
+
+class RateLimiter:
+    """Bounded in-process per-client rate limiter (fixed one-minute window).
+
+    Keeps the auth entry points from burning bcrypt/crypto cycles on
+    brute-force or runaway clients. Counters live in a TTLCache so idle
+    clients age out and memory stays bounded.
+    """
+
+    def __init__(self, limit: int, window: int = 60, maxsize: int = 10_000):
+        self.limit = limit
+        self._counters: TTLCache = TTLCache(maxsize=maxsize, ttl=window)
+
+    def check(self, request: Request) -> None:
+        """Raise 429 if the client exceeded its budget for this window."""
+        client = request.client.host if request.client else "unknown"
+        count = self._counters.get(client, 0)
+        if count >= self.limit:
+            logger.warning("rate_limit_exceeded", client=client, path=request.url.path)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests"
+            )
+        self._counters[client] = count + 1
+
 
 class LoginRequest(BaseModel):
     """Login request model."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     username: str
     password: str
 
 
-class TokenResponse(BaseModel):
-    """Token response model."""
-    access_token: str
-    token_type: str = "bearer"
-
-
 class OAuthTokenRequest(BaseModel):
     """OAuth token request model."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     grant_type: str
     code: Optional[str] = None
     redirect_uri: Optional[str] = None
@@ -47,13 +174,17 @@ class OAuthTokenRequest(BaseModel):
 
 class ToolCallRequest(BaseModel):
     """Tool call request model."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     tool: str
-    arguments: dict
+    arguments: dict[str, Any]
+
 
+class BatchToolCallRequest(BaseModel):
+    """Batch tool call request model."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
 
-class ToolListResponse(BaseModel):
-    """Tool list response model."""
-    tools: list
+    calls: list[ToolCallRequest]
 
 
 def create_app() -> FastAPI:
@@ -61,100 +192,216 @@ def create_app() -> FastAPI:
     
     settings = get_settings()
     
-    # Create MCP ASGI app with internal path="/" 
+    # Create MCP ASGI app with internal path="/"
     # When mounted at "/mcp", the endpoint will be "/mcp/"
     mcp_asgi_app = mcp.http_app(path="/")
-    
-    # Create FastAPI app with MCP lifespan (CRITICAL for MCP to work)
+
+    auth_manager = AuthManager(settings, oauth_manager=oauth_manager)
+    cache_manager = CacheManager(
+        redis_client=create_redis_client(settings),
+        ttl=settings.cache_ttl,
+        maxsize=settings.local_cache_max
+    )
+    odoo_client = OdooClient(settings, cache_manager)
+
+    # Pre-encoded once so the constant-time comparison in /login skips the
+    # per-request unicode encoding of the expected credentials.
+    expected_username = settings.odoo_username.encode()
+    expected_password = settings.odoo_password.encode()
+    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
+
+    login_limiter = RateLimiter(limit=10)
+    oauth_limiter = RateLimiter(limit=30)
+
+    # Settings are immutable after startup, so the public URL is a constant.
+    server_url = settings.get_server_url()
+
+    # Shared dependency object so every authenticated route reuses the same
+    # cached dependency subtree.
+    auth_dep = Depends(auth_manager.verify_request)
+
+    # The authenticated Odoo UID is valid until credentials change, so a short
+    # TTL collapses probe and login auth traffic into one round-trip per window.
+    uid_cache: TTLCache = TTLCache(maxsize=1, ttl=30)
+    uid_lock = asyncio.Lock()
+
+    async def cached_authenticate() -> int:
+        """Authenticate with Odoo, serving a recently verified UID from cache."""
+        uid = uid_cache.get("uid")
+        if uid is None:
+            # On a cold cache a burst of probes would each fire its own RPC;
+            # the lock lets one caller refresh while the rest reuse its result.
+            async with uid_lock:
+                uid = uid_cache.get("uid")
+                if uid is None:
+                    # authenticate() is a blocking RPC call; keep it off the event loop.
+                    uid = await asyncio.to_thread(odoo_client.authenticate)
+                    uid_cache["uid"] = uid
+        return uid
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        """Startup/shutdown wrapper around the MCP app's lifespan (CRITICAL for MCP to work)."""
+        logger.info("http_server_starting", port=settings.port, host=settings.host)
+
+        # Expose the per-worker singletons on app.state so they are reachable
+        # without the create_app closure (e.g. from tests or custom deps).
+        app.state.auth_manager = auth_manager
+        app.state.cache_manager = cache_manager
+        app.state.odoo_client = odoo_client
+
+        if settings.odoo_url and settings.odoo_db and settings.odoo_username:
+            try:
+                uid = await cached_authenticate()
+                app.state.odoo_uid = uid
+                logger.info("odoo_authenticated", uid=uid)
+            except Exception as e:
+                logger.warning("odoo_authentication_failed", error=str(e))
+        else:
+            logger.warning("odoo_credentials_not_configured", message="Set ODOO_URL, ODOO_DB, ODOO_USERNAME, and ODOO_PASSWORD to use Odoo features")
+
+        async with mcp_asgi_app.lifespan(app):
+            yield
+
+        # Release connection pools cleanly on shutdown, including the
+        # singleton the FastMCP tools share.
+        odoo_client.close()
+        close_odoo_client()
+        await cache_manager.close()
+        logger.info("http_server_shutting_down")
+
     app = FastAPI(
         title="Odoo MCP Server",
         description="Enhanced MCP server for Odoo with API authentication",
         version="2.0.0",
         docs_url="/docs",
         redoc_url="/redoc",
-        lifespan=mcp_asgi_app.lifespan
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
     )
     
+    # Explicit origin and header lists let CORSMiddleware emit prebuilt
+    # constant preflight responses; wildcard + credentials forces per-request
+    # Origin echoing (and violates the CORS spec).
+    allowed_origins = settings.get_allowed_origins()
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        allow_origins=allowed_origins,
+        allow_credentials="*" not in allowed_origins,
+        allow_methods=["GET", "POST", "OPTIONS"],
+        allow_headers=["Authorization", "Content-Type"],
+        # Let browsers cache preflight results for a day so repeated
+        # tool-call traffic skips the OPTIONS round-trip entirely.
+        max_age=86400,
     )
     
-    # OAuth middleware for MCP endpoints
-    class OAuthMiddleware(BaseHTTPMiddleware):
-        async def dispatch(self, request: Request, call_next):
+    # OAuth middleware for MCP endpoints. Implemented as pure ASGI rather
+    # than BaseHTTPMiddleware: the latter wraps every request in streams,
+    # task groups, and a Request/Response pair even on passthrough, which
+    # costs real latency on the hot /call_tool and /mcp paths.
+    class OAuthMiddleware:
+        def __init__(self, app: ASGIApp):
+            self.app = app
+
+        async def __call__(self, scope: Scope, receive: Receive, send: Send):
             # Solo validar OAuth para rutas MCP
-            if request.url.path.startswith("/mcp"):
-                auth_header = request.headers.get("Authorization")
-                
-                if not auth_header:
-                    logger.warning("mcp_no_auth_header", path=request.url.path)
-                    return JSONResponse(
-                        status_code=401,
-                        content={"error": "unauthorized", "detail": "Missing Authorization header"}
-                    )
-                
-                # Extraer Bearer token
-                parts = auth_header.split()
-                if len(parts) != 2 or parts[0].lower() != "bearer":
-                    logger.warning("mcp_invalid_auth_format", auth_header=auth_header[:20])
-                    return JSONResponse(
-                        status_code=401,
-                        content={"error": "unauthorized", "detail": "Invalid Authorization header format"}
-                    )
-                
-                token = parts[1]
-                
-                # Validar token OAuth
-                if not oauth_manager.validate_token(token):
-                    logger.warning("mcp_invalid_token", token=token[:10] + "...")
-                    return JSONResponse(
-                        status_code=401,
-                        content={"error": "unauthorized", "detail": "Invalid or expired access token"}
-                    )
-                
-                logger.debug("mcp_auth_success", token=token[:10] + "...")
-            
-            response = await call_next(request)
-            return response
-    
+            if scope["type"] != "http" or not scope["path"].startswith("/mcp"):
+                return await self.app(scope, receive, send)
+
+            # Rewrite /mcp to /mcp/ in the scope instead of answering with a
+            # 308 redirect; saves clients a full extra round-trip per frame.
+            if scope["path"] == "/mcp":
+                scope["path"] = "/mcp/"
+                scope["raw_path"] = b"/mcp/"
+
+            auth_header = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    auth_header = value.decode("latin-1")
+                    break
+
+            if not auth_header:
+                logger.warning("mcp_no_auth_header", path=scope["path"])
+                response = ORJSONResponse(
+                    status_code=401,
+                    content={"error": "unauthorized", "detail": "Missing Authorization header"}
+                )
+                return await response(scope, receive, send)
+
+            # Extraer Bearer token
+            parts = auth_header.split()
+            if len(parts) != 2 or parts[0].lower() != "bearer":
+                logger.warning("mcp_invalid_auth_format", auth_header=auth_header[:20])
+                response = ORJSONResponse(
+                    status_code=401,
+                    content={"error": "unauthorized", "detail": "Invalid Authorization header format"}
+                )
+                return await response(scope, receive, send)
+
+            token = parts[1]
+
+            # Validar token OAuth
+            if not oauth_manager.validate_token(token):
+                logger.warning("mcp_invalid_token", token=token[:10] + "...")
+                response = ORJSONResponse(
+                    status_code=401,
+                    content={"error": "unauthorized", "detail": "Invalid or expired access token"}
+                )
+                return await response(scope, receive, send)
+
+            logger.debug("mcp_auth_success", token=token[:10] + "...")
+            await self.app(scope, receive, send)
+
     app.add_middleware(OAuthMiddleware)
-    
-    auth_manager = AuthManager(settings, oauth_manager=oauth_manager)
-    cache_manager = CacheManager(ttl=settings.cache_ttl)
-    odoo_client = OdooClient(settings, cache_manager)
-    basic_security = HTTPBasic(auto_error=False)
-    
+
+    # The root payload never changes, so serialize it once instead of
+    # rebuilding the dict and re-encoding it for every load-balancer hit.
+    root_bytes = orjson.dumps({
+        "name": "Odoo MCP Server",
+        "version": "2.0.0",
+        "status": "running",
+        "endpoints": {
+            "mcp_streamable": "/mcp (POST - for N8N MCP node)",
+            "docs": "/docs",
+            "tools": "/tools",
+            "call_tool": "/call_tool",
+            "login": "/login",
+            "webhook_n8n": "/webhook/n8n"
+        },
+        "n8n_connection": {
+            "transport": "HTTP Streamable",
+            "endpoint": "/mcp",
+            "authentication": "Bearer token (use API_KEYS from env or JWT from /login)"
+        }
+    })
+
+    root_etag = f'"{hashlib.md5(root_bytes).hexdigest()[:16]}"'
+
     @app.get("/")
-    async def root():
+    async def root(request: Request):
         """Root endpoint."""
-        return {
-            "name": "Odoo MCP Server",
-            "version": "2.0.0",
-            "status": "running",
-            "endpoints": {
-                "mcp_streamable": "/mcp (POST - for N8N MCP node)",
-                "docs": "/docs",
-                "tools": "/tools",
-                "call_tool": "/call_tool",
-                "login": "/login",
-                "webhook_n8n": "/webhook/n8n"
-            },
-            "n8n_connection": {
-                "transport": "HTTP Streamable",
-                "endpoint": "/mcp",
-                "authentication": "Bearer token (use API_KEYS from env or JWT from /login)"
-            }
-        }
+        if request.headers.get("if-none-match") == root_etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": root_etag})
+
+        return Response(
+            content=root_bytes,
+            media_type="application/json",
+            headers={"ETag": root_etag, "Cache-Control": "public, max-age=60"}
+        )
     
     @app.get("/health")
     async def health():
         """Health check endpoint."""
         try:
-            uid = odoo_client.authenticate()
+            # Recent successful RPC traffic (tool calls, login) already
+            # proves the connection is good — skip even the thread hop.
+            if odoo_client.uid is not None and monotonic() - odoo_client.last_ok < 10:
+                return {
+                    "status": "healthy",
+                    "odoo_connected": True,
+                    "odoo_uid": odoo_client.uid
+                }
+            uid = await cached_authenticate()
             return {
                 "status": "healthy",
                 "odoo_connected": True,
@@ -162,7 +409,7 @@ def create_app() -> FastAPI:
             }
         except Exception as e:
             logger.error("health_check_failed", error=str(e))
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 content={
                     "status": "unhealthy",
@@ -171,24 +418,27 @@ def create_app() -> FastAPI:
                 }
             )
     
-    @app.post("/login", response_model=TokenResponse)
-    async def login(request: LoginRequest):
+    @app.post("/login")
+    async def login(request: LoginRequest, http_request: Request):
         """
         Login endpoint to get JWT token.
-        
+
         Validates credentials against Odoo credentials configured in environment.
         For production use, consider implementing a proper user database.
         """
+        login_limiter.check(http_request)
         logger.info("login_attempt", username=request.username)
         
-        if not settings.odoo_username or not settings.odoo_password:
+        if not (expected_username and expected_password):
             logger.error("login_failed_no_credentials_configured")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Server authentication not configured. Set ODOO_USERNAME and ODOO_PASSWORD."
             )
         
-        if request.username != settings.odoo_username or request.password != settings.odoo_password:
+        username_ok = hmac.compare_digest(request.username.encode(), expected_username)
+        password_ok = hmac.compare_digest(request.password.encode(), expected_password)
+        if not (username_ok and password_ok):
             logger.warning("login_failed_invalid_credentials", username=request.username)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -196,7 +446,7 @@ def create_app() -> FastAPI:
             )
         
         try:
-            uid = odoo_client.authenticate()
+            uid = await cached_authenticate()
             logger.info("odoo_authentication_verified", uid=uid)
         except Exception as e:
             logger.error("odoo_authentication_failed_during_login", error=str(e))
@@ -205,18 +455,18 @@ def create_app() -> FastAPI:
                 detail="Authentication failed: unable to verify credentials with Odoo"
             )
         
-        access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
         access_token = auth_manager.create_access_token(
             data={"sub": request.username, "odoo_uid": uid},
             expires_delta=access_token_expires
         )
         
         logger.info("login_successful", username=request.username, odoo_uid=uid)
-        
-        return TokenResponse(access_token=access_token)
+
+        return {"access_token": access_token, "token_type": "bearer"}
     
     @app.get("/oauth/authorize")
     async def oauth_authorize(
+        request: Request,
         response_type: str,
         client_id: str,
         redirect_uri: str,
@@ -225,9 +475,10 @@ def create_app() -> FastAPI:
     ):
         """
         OAuth 2.0 authorization endpoint.
-        
+
         Shows consent page for OAuth clients like ChatGPT.
         """
+        oauth_limiter.check(request)
         logger.info(
             "oauth_authorize_request",
             client_id=client_id,
@@ -249,61 +500,24 @@ def create_app() -> FastAPI:
             
             client_name = client.get("client_name", "Unknown Application")
             requested_scope = scope or client.get("scope", "odoo:read odoo:write")
-            
+
             # Mostrar página de consentimiento
-            consent_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <meta name="viewport" content="width=device-width, initial-scale=1.0">
-                <title>Authorize Access</title>
-                <style>
-                    body {{ font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif; 
-                           display: flex; justify-content: center; align-items: center; 
-                           min-height: 100vh; margin: 0; background: #f5f5f5; }}
-                    .container {{ background: white; padding: 2rem; border-radius: 8px; 
-                                 box-shadow: 0 2px 10px rgba(0,0,0,0.1); max-width: 400px; }}
-                    h1 {{ margin: 0 0 1rem; color: #333; }}
-                    .client-name {{ color: #0066cc; font-weight: 600; }}
-                    .scopes {{ background: #f8f9fa; padding: 1rem; border-radius: 4px; margin: 1rem 0; }}
-                    .scope-item {{ margin: 0.5rem 0; }}
-                    button {{ width: 100%; padding: 0.75rem; border: none; border-radius: 4px; 
-                             font-size: 1rem; cursor: pointer; font-weight: 600; }}
-                    .authorize {{ background: #0066cc; color: white; margin-bottom: 0.5rem; }}
-                    .authorize:hover {{ background: #0052a3; }}
-                    .deny {{ background: #e0e0e0; color: #666; }}
-                    .deny:hover {{ background: #d0d0d0; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <h1>Authorize Access</h1>
-                    <p><span class="client-name">{client_name}</span> wants to access your Odoo data.</p>
-                    
-                    <div class="scopes">
-                        <strong>Permissions requested:</strong>
-                        <div class="scope-item">✓ Read Odoo data</div>
-                        <div class="scope-item">✓ Write Odoo data</div>
-                    </div>
-                    
-                    <form method="post" action="/oauth/authorize/approve">
-                        <input type="hidden" name="client_id" value="{client_id}">
-                        <input type="hidden" name="redirect_uri" value="{redirect_uri}">
-                        <input type="hidden" name="state" value="{state or ''}">
-                        <input type="hidden" name="scope" value="{requested_scope}">
-                        <button type="submit" class="authorize">Authorize</button>
-                    </form>
-                    
-                    <button class="deny" onclick="window.location.href='{redirect_uri}?error=access_denied&state={state or ''}'">
-                        Deny
-                    </button>
-                </div>
-            </body>
-            </html>
-            """
-            
-            return HTMLResponse(content=consent_html)
+            deny_url = f"{redirect_uri}?" + urlencode(
+                {"error": "access_denied", "state": state or ""}
+            )
+            consent_html = CONSENT_PAGE.render(
+                client_name=client_name,
+                client_id=client_id,
+                redirect_uri=redirect_uri,
+                state=state or "",
+                scope=requested_scope,
+                deny_url=deny_url,
+            )
+
+            return HTMLResponse(
+                content=consent_html,
+                headers={"Cache-Control": "no-store"}
+            )
             
         except ValueError as e:
             logger.error("oauth_authorize_error", error=str(e))
@@ -331,10 +545,12 @@ def create_app() -> FastAPI:
                 scope=scope
             )
             
-            # Redirect back to client with code
-            redirect_url = f"{redirect_uri}?code={code}"
+            # Redirect back to client with code (urlencode also escapes
+            # reserved characters correctly)
+            params = {"code": code}
             if state:
-                redirect_url += f"&state={state}"
+                params["state"] = state
+            redirect_url = f"{redirect_uri}?{urlencode(params)}"
             
             logger.info("oauth_consent_approved", client_id=client_id)
             
@@ -349,13 +565,13 @@ def create_app() -> FastAPI:
     
     @app.post("/oauth/token")
     async def oauth_token(
+        request: Request,
         grant_type: str = Form(...),
         code: Optional[str] = Form(None),
         redirect_uri: Optional[str] = Form(None),
         client_id: Optional[str] = Form(None),
         client_secret: Optional[str] = Form(None),
-        refresh_token: Optional[str] = Form(None),
-        basic_credentials: Optional[HTTPBasicCredentials] = Depends(basic_security)
+        refresh_token: Optional[str] = Form(None)
     ):
         """
         OAuth 2.0 token endpoint (RFC 6749).
@@ -364,13 +580,15 @@ def create_app() -> FastAPI:
         Supports HTTP Basic Auth for client credentials (preferred by ChatGPT) or form parameters.
         Exchange authorization code for access token or refresh an existing token.
         """
+        oauth_limiter.check(request)
+
         # Extract client credentials from HTTP Basic Auth if present, otherwise use form data
         final_client_id = client_id
         final_client_secret = client_secret
-        
+
+        basic_credentials = _parse_basic(request.headers.get("authorization"))
         if basic_credentials:
-            final_client_id = basic_credentials.username
-            final_client_secret = basic_credentials.password
+            final_client_id, final_client_secret = basic_credentials
             logger.info("oauth_token_request_basic_auth", grant_type=grant_type, client_id=final_client_id)
         else:
             logger.info("oauth_token_request_form", grant_type=grant_type, client_id=final_client_id)
@@ -378,17 +596,12 @@ def create_app() -> FastAPI:
         try:
             if grant_type == "authorization_code":
                 # Exchange code for token
-                if not all([code, final_client_id, redirect_uri]):
+                if not (code and final_client_id and redirect_uri):
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Missing required parameters for authorization_code grant"
                     )
-                
-                # Type assertions after validation
-                assert code is not None
-                assert final_client_id is not None
-                assert redirect_uri is not None
-                
+
                 # Obtener cliente para verificar si requiere secret
                 client = oauth_manager.get_client(final_client_id)
                 if not client:
@@ -417,16 +630,12 @@ def create_app() -> FastAPI:
                 
             elif grant_type == "refresh_token":
                 # Refresh token
-                if not all([refresh_token, final_client_id]):
+                if not (refresh_token and final_client_id):
                     raise HTTPException(
                         status_code=status.HTTP_400_BAD_REQUEST,
                         detail="Missing required parameters for refresh_token grant"
                     )
-                
-                # Type assertions after validation
-                assert refresh_token is not None
-                assert final_client_id is not None
-                
+
                 # Obtener cliente para verificar si requiere secret
                 client = oauth_manager.get_client(final_client_id)
                 if not client:
@@ -465,42 +674,49 @@ def create_app() -> FastAPI:
                 detail=str(e)
             )
     
+    # Discovery metadata only depends on server_url, so both documents are
+    # serialized once at app construction and served as static bytes.
+    authorization_server_metadata_bytes = orjson.dumps({
+        "issuer": server_url,
+        "authorization_endpoint": f"{server_url}/oauth/authorize",
+        "token_endpoint": f"{server_url}/oauth/token",
+        "registration_endpoint": f"{server_url}/oauth/register",
+        "response_types_supported": ["code"],
+        "grant_types_supported": ["authorization_code", "refresh_token"],
+        "token_endpoint_auth_methods_supported": ["none", "client_secret_basic", "client_secret_post"],
+        "scopes_supported": ["odoo:read", "odoo:write"],
+        "code_challenge_methods_supported": ["plain", "S256"]
+    })
+    protected_resource_metadata_bytes = orjson.dumps({
+        "resource": server_url,
+        "authorization_servers": [server_url],
+        "scopes_supported": ["odoo:read", "odoo:write"],
+        "bearer_methods_supported": ["header"]
+    })
+
     @app.get("/.well-known/oauth-authorization-server")
     async def oauth_authorization_server_metadata():
         """
         OAuth 2.0 Authorization Server Metadata (RFC 8414).
-        
+
         Provides discovery information for OAuth clients like ChatGPT.
         """
-        server_url = settings.get_server_url()
-        
-        return {
-            "issuer": server_url,
-            "authorization_endpoint": f"{server_url}/oauth/authorize",
-            "token_endpoint": f"{server_url}/oauth/token",
-            "registration_endpoint": f"{server_url}/oauth/register",
-            "response_types_supported": ["code"],
-            "grant_types_supported": ["authorization_code", "refresh_token"],
-            "token_endpoint_auth_methods_supported": ["none", "client_secret_basic", "client_secret_post"],
-            "scopes_supported": ["odoo:read", "odoo:write"],
-            "code_challenge_methods_supported": ["plain", "S256"]
-        }
-    
+        return Response(
+            content=authorization_server_metadata_bytes,
+            media_type="application/json"
+        )
+
     @app.get("/.well-known/oauth-protected-resource")
     async def oauth_protected_resource_metadata():
         """
         OAuth 2.0 Protected Resource Metadata (RFC 9728).
-        
+
         Indicates that this resource server uses OAuth for authentication.
         """
-        server_url = settings.get_server_url()
-        
-        return {
-            "resource": server_url,
-            "authorization_servers": [server_url],
-            "scopes_supported": ["odoo:read", "odoo:write"],
-            "bearer_methods_supported": ["header"]
-        }
+        return Response(
+            content=protected_resource_metadata_bytes,
+            media_type="application/json"
+        )
     
     @app.post("/oauth/register")
     async def oauth_register(request: Request):
@@ -552,53 +768,57 @@ def create_app() -> FastAPI:
                 detail=str(e)
             )
     
-    @app.get("/oauth/credentials")
-    async def oauth_credentials():
-        """
-        Get OAuth client credentials for setup.
-        
-        This endpoint is for initial configuration only.
-        In production, protect this endpoint or remove it.
-        """
-        credentials = oauth_manager.get_client_credentials()
-        server_url = settings.get_server_url()
-        
-        logger.info("oauth_credentials_retrieved", server_url=server_url)
-        
-        return {
-            **credentials,
+    if settings.expose_oauth_credentials:
+        # Credentials and server URL are static for the process; build the
+        # payload once at registration time.
+        credentials_bytes = orjson.dumps({
+            **oauth_manager.get_client_credentials(),
             "authorization_url": f"{server_url}/oauth/authorize",
             "token_url": f"{server_url}/oauth/token",
             "scopes": ["odoo:read", "odoo:write"],
             "note": "Use these credentials to configure ChatGPT or other OAuth clients"
-        }
+        })
+
+        @app.get("/oauth/credentials")
+        async def oauth_credentials(auth: dict = auth_dep):
+            """
+            Get OAuth client credentials for setup.
+
+            Requires authentication; disable entirely in production via
+            EXPOSE_OAUTH_CREDENTIALS=false.
+            """
+            logger.info("oauth_credentials_retrieved", auth_type=auth.get("auth_type"))
+
+            return Response(content=credentials_bytes, media_type="application/json")
     
-    @app.get("/tools", response_model=ToolListResponse)
-    async def list_tools(auth: dict = Depends(auth_manager.verify_request)):
+    # Tool definitions are static for the life of the process; the payload
+    # is serialized once at import in tools.py.
+    tools_response_bytes = get_tools_json_bytes()
+
+    tools_etag = f'"{hashlib.md5(tools_response_bytes).hexdigest()[:16]}"'
+
+    @app.get("/tools")
+    async def list_tools(request: Request, auth: dict = auth_dep):
         """
         List all available MCP tools.
-        
+
         Requires authentication via API key or JWT token.
         """
         logger.info("tools_listed", auth_type=auth.get("auth_type"))
-        
-        tools = get_tools()
-        
-        return ToolListResponse(
-            tools=[
-                {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "inputSchema": tool.inputSchema
-                }
-                for tool in tools
-            ]
+
+        if request.headers.get("if-none-match") == tools_etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tools_etag})
+
+        return Response(
+            content=tools_response_bytes,
+            media_type="application/json",
+            headers={"ETag": tools_etag, "Cache-Control": "private, max-age=60"}
         )
     
     @app.post("/call_tool")
     async def call_tool(
         request: ToolCallRequest,
-        auth: dict = Depends(auth_manager.verify_request)
+        auth: dict = auth_dep
     ):
         """
         Call an MCP tool.
@@ -617,10 +837,18 @@ def create_app() -> FastAPI:
                 request.arguments,
                 odoo_client
             )
-            
+
+            text = result[0].text if result else None
+
+            if text is not None and len(text) > LARGE_RESULT_THRESHOLD:
+                return StreamingResponse(
+                    _stream_text_json(b'{"success":true,"result":"', text, b'"}'),
+                    media_type="application/json"
+                )
+
             return {
                 "success": True,
-                "result": result[0].text if result else None
+                "result": text
             }
             
         except Exception as e:
@@ -629,11 +857,45 @@ def create_app() -> FastAPI:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e)
             )
-    
+
+    @app.post("/call_tools")
+    async def call_tools(
+        request: BatchToolCallRequest,
+        auth: dict = auth_dep
+    ):
+        """
+        Call several MCP tools in one request.
+
+        Authentication, connection setup and response serialization are paid
+        once for the whole batch; the calls themselves run concurrently.
+        Per-call failures are reported in-place instead of failing the batch.
+        """
+        logger.info(
+            "batch_tool_call_requested",
+            count=len(request.calls),
+            auth_type=auth.get("auth_type")
+        )
+
+        async def run_call(call: ToolCallRequest) -> dict:
+            try:
+                result = await handle_tool_call(call.tool, call.arguments, odoo_client)
+                return {
+                    "success": True,
+                    "tool": call.tool,
+                    "result": result[0].text if result else None
+                }
+            except Exception as e:
+                logger.error("batch_tool_call_error", tool=call.tool, error=str(e))
+                return {"success": False, "tool": call.tool, "error": str(e)}
+
+        results = await asyncio.gather(*(run_call(call) for call in request.calls))
+
+        return {"results": results}
+
     @app.post("/webhook/n8n")
     async def n8n_webhook(
         request: ToolCallRequest,
-        auth: dict = Depends(auth_manager.verify_request)
+        auth: dict = auth_dep
     ):
         """
         N8N-specific webhook endpoint.
@@ -648,18 +910,28 @@ def create_app() -> FastAPI:
                 request.arguments,
                 odoo_client
             )
-            
-            return JSONResponse(
+
+            text = result[0].text if result else None
+
+            if text is not None and len(text) > LARGE_RESULT_THRESHOLD:
+                return StreamingResponse(
+                    _stream_text_json(
+                        b'{"success":true,"webhook":"n8n","data":"', text, b'"}'
+                    ),
+                    media_type="application/json"
+                )
+
+            return ORJSONResponse(
                 content={
                     "success": True,
-                    "data": result[0].text if result else None,
+                    "data": text,
                     "webhook": "n8n"
                 }
             )
             
         except Exception as e:
             logger.error("n8n_webhook_error", tool=request.tool, error=str(e))
-            return JSONResponse(
+            return ORJSONResponse(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 content={
                     "success": False,
@@ -668,36 +940,47 @@ def create_app() -> FastAPI:
                 }
             )
     
-    @app.on_event("startup")
-    async def startup_event():
-        """Run on application startup."""
-        logger.info("http_server_starting", port=settings.port, host=settings.host)
-        
-        if settings.odoo_url and settings.odoo_db and settings.odoo_username:
+    @app.post("/webhook/n8n/batch")
+    async def n8n_webhook_batch(
+        request: BatchToolCallRequest,
+        auth: dict = auth_dep
+    ):
+        """
+        Batch variant of the N8N webhook.
+
+        One authenticated HTTP request carries many tool calls, which run
+        concurrently — amortizes auth and dispatch overhead when N8N loops
+        a node over many records.
+        """
+        logger.info("n8n_batch_called", count=len(request.calls))
+
+        async def run_call(call: ToolCallRequest) -> dict:
             try:
-                uid = odoo_client.authenticate()
-                logger.info("odoo_authenticated", uid=uid)
+                result = await handle_tool_call(call.tool, call.arguments, odoo_client)
+                return {
+                    "success": True,
+                    "tool": call.tool,
+                    "data": result[0].text if result else None
+                }
             except Exception as e:
-                logger.warning("odoo_authentication_failed", error=str(e))
-        else:
-            logger.warning("odoo_credentials_not_configured", message="Set ODOO_URL, ODOO_DB, ODOO_USERNAME, and ODOO_PASSWORD to use Odoo features")
-    
-    @app.on_event("shutdown")
-    async def shutdown_event():
-        """Run on application shutdown."""
-        logger.info("http_server_shutting_down")
-    
-    # Add explicit handler for /mcp without trailing slash
-    # Redirect to /mcp/ with 308 (Permanent Redirect that preserves method)
-    @app.api_route("/mcp", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"], include_in_schema=False)
-    async def mcp_redirect():
-        """Redirect /mcp to /mcp/ preserving the request method."""
-        return RedirectResponse(url="/mcp/", status_code=308)
-    
-    # Mount MCP app AFTER explicit redirect route
-    # The MCP endpoint will be at /mcp/
+                logger.error("n8n_batch_call_error", tool=call.tool, error=str(e))
+                return {"success": False, "tool": call.tool, "error": str(e)}
+
+        results = await asyncio.gather(*(run_call(call) for call in request.calls))
+
+        return ORJSONResponse(
+            content={
+                "success": True,
+                "results": list(results),
+                "count": len(results),
+                "webhook": "n8n"
+            }
+        )
+
+    # Mount MCP app at /mcp; the OAuth middleware rewrites bare /mcp to /mcp/
+    # in the ASGI scope, so no redirect route is needed.
     app.mount("/mcp", mcp_asgi_app)
-    logger.info("mcp_http_endpoint_ready", paths=["/mcp (redirects to /mcp/)", "/mcp/"])
+    logger.info("mcp_http_endpoint_ready", paths=["/mcp", "/mcp/"])
     
     return app
 
@@ -705,15 +988,33 @@ def create_app() -> FastAPI:
 def run_http_server():
     """Run the HTTP server."""
     settings = get_settings()
-    
-    app = create_app()
-    
-    uvicorn.run(
-        app,
-        host=settings.host,
-        port=settings.port,
-        log_level=settings.log_level.lower()
-    )
+
+    uvicorn_kwargs = {
+        "host": settings.host,
+        "port": settings.port,
+        # uvloop is not available on Windows; uvicorn falls back cleanly there.
+        "loop": "uvloop" if sys.platform != "win32" else "asyncio",
+        "http": "httptools",
+        "log_level": settings.log_level.lower(),
+        # Honour X-Forwarded-* from the reverse proxy, hold keep-alive
+        # connections long enough for N8N/ChatGPT call bursts, and widen the
+        # accept backlog for connection spikes.
+        "proxy_headers": True,
+        "timeout_keep_alive": 30,
+        "backlog": 2048,
+    }
+
+    if settings.workers > 1:
+        # Multi-process mode needs an import string so each worker can build
+        # its own app instance.
+        uvicorn.run(
+            "mcp_server_odoo.http_server:create_app",
+            factory=True,
+            workers=settings.workers,
+            **uvicorn_kwargs
+        )
+    else:
+        uvicorn.run(create_app(), **uvicorn_kwargs)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 """FastMCP tools definition for streamable HTTP transport."""
 
+from functools import lru_cache
 from fastmcp import FastMCP
 from typing import Annotated, Any
 from pydantic import Field
@@ -15,17 +16,56 @@ logger = structlog.get_logger()
 mcp = FastMCP("odoo-mcp-server", version="2.0.0")
 
 
+@lru_cache(maxsize=1)
 def get_odoo_client():
-    """Get configured Odoo client."""
+    """Get the shared Odoo client (built once per process).
+
+    Rebuilding the client per tool call would discard the CacheManager's
+    in-process cache and the HTTP connection pool between calls; the
+    singleton keeps cache hits and keep-alive connections across tools.
+    """
     settings = get_settings()
-    cache_manager = CacheManager(ttl=settings.cache_ttl)
+    cache_manager = CacheManager(ttl=settings.cache_ttl, maxsize=settings.local_cache_max)
     return OdooClient(settings, cache_manager)
 
 
+# Conservative projections used when the caller omits `fields`: reading
+# "all fields" on wide models triggers every computed field server-side
+# and returns payloads dominated by data the LLM never asked about.
+DEFAULT_FIELDS = {
+    "res.partner": ["name", "email", "phone", "street", "city", "country_id"],
+    "sale.order": ["name", "partner_id", "date_order", "amount_total", "state"],
+    "product.product": ["name", "default_code", "list_price", "qty_available"],
+    "account.move": ["name", "partner_id", "invoice_date", "amount_total", "state"],
+}
+
+
+def _project_fields(model: str, fields: list[str] | None) -> list[str] | None:
+    """Substitute a default projection for known wide models."""
+    if fields is not None:
+        return fields
+    default = DEFAULT_FIELDS.get(model)
+    if default is not None:
+        logger.debug("default_field_projection", model=model, fields=default)
+    return default
+
+
+def _error(e: Exception, message: str) -> dict:
+    """Uniform failure payload shared by every tool."""
+    return {"success": False, "error": str(e), "message": message}
+
+
+def close_odoo_client():
+    """Close the shared client's connection pool, if one was built."""
+    if get_odoo_client.cache_info().currsize:
+        get_odoo_client().close()
+        get_odoo_client.cache_clear()
+
+
 @mcp.tool()
 async def odoo_search_records(
     model: Annotated[str, Field(description="The Odoo model name (e.g., 'res.partner', 'sale.order')")],
-    domain: Annotated[list, Field(
+    domain: Annotated[list | None, Field(
         description="Search criteria as list of lists (Odoo domain). Examples: [['name', 'ilike', 'John']], [['id', 'in', [1,2,3]]], or [] for all records. Each filter is a list with [field, operator, value]",
         json_schema_extra={
             "type": "array",
@@ -53,7 +93,7 @@ async def odoo_search_records(
                 }
             }
         }
-    )] = [],
+    )] = None,
     limit: Annotated[int, Field(description="Maximum records to return")] = 10,
     offset: Annotated[int, Field(description="Skip this many records for pagination")] = 0,
     order: Annotated[str | None, Field(description="Sort order (e.g., 'name asc', 'create_date desc')")] = None
@@ -61,9 +101,13 @@ async def odoo_search_records(
     """
     Search for records in any Odoo model using domain filters.
     
-    This tool allows you to find records in Odoo models like customers (res.partner), 
+    This tool allows you to find records in Odoo models like customers (res.partner),
     sales orders (sale.order), products (product.product), invoices (account.move), etc.
-    
+
+    If you plan to read the matching records afterwards, prefer
+    odoo_search_read_records instead: it returns the data in one round-trip
+    rather than two.
+
     Args:
         model: The Odoo model name (e.g., 'res.partner' for contacts, 'sale.order' for sales)
         domain: Search criteria as list of tuples. Examples:
@@ -88,28 +132,27 @@ async def odoo_search_records(
         }
     except Exception as e:
         logger.error("search_error", model=model, error=str(e))
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Error searching {model}"
-        }
+        return _error(e, f"Error searching {model}")
 
 
 @mcp.tool()
 async def odoo_read_records(
     model: Annotated[str, Field(description="The Odoo model name")],
     ids: Annotated[list[int], Field(description="List of record IDs to read")],
-    fields: Annotated[list[str] | None, Field(description="Specific fields to retrieve. If not specified, returns all fields")] = None
+    fields: Annotated[list[str] | None, Field(description="Specific fields to retrieve. If not specified, a compact default set is used for common models (all fields otherwise)")] = None
 ) -> dict:
     """
     Read detailed information from Odoo records.
-    
-    Use this after searching to get the actual data from records.
-    
+
+    Use this when you already know the record IDs. If the IDs would come
+    from a search you just ran, use odoo_search_read_records instead — it
+    fuses search + read into a single call.
+
     Args:
         model: The Odoo model name
         ids: List of record IDs to read (from search results)
-        fields: Specific fields to retrieve. If not specified, returns all fields.
+        fields: Specific fields to retrieve. If not specified, a compact default
+                set is used for common models (all fields for unknown models).
                 Common fields by model:
                 - res.partner: name, email, phone, street, city, country_id
                 - sale.order: name, partner_id, date_order, amount_total, state
@@ -120,7 +163,7 @@ async def odoo_read_records(
     """
     client = get_odoo_client()
     try:
-        result = await client.read(model, ids, fields)
+        result = await client.read(model, ids, _project_fields(model, fields))
         return {
             "success": True,
             "records": result,
@@ -129,17 +172,13 @@ async def odoo_read_records(
         }
     except Exception as e:
         logger.error("read_error", model=model, ids=ids, error=str(e))
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Error reading from {model}"
-        }
+        return _error(e, f"Error reading from {model}")
 
 
 @mcp.tool()
 async def odoo_search_read_records(
     model: Annotated[str, Field(description="The Odoo model name")],
-    domain: Annotated[list, Field(
+    domain: Annotated[list | None, Field(
         description="Search criteria as list of lists (Odoo domain). Same format as odoo_search_records. Supports complex filters like [['id', 'in', [1,2,3]]]",
         json_schema_extra={
             "type": "array",
@@ -167,7 +206,7 @@ async def odoo_search_read_records(
                 }
             }
         }
-    )] = [],
+    )] = None,
     fields: Annotated[list[str] | None, Field(description="Fields to retrieve in results")] = None,
     limit: Annotated[int, Field(description="Maximum records")] = 10,
     offset: Annotated[int, Field(description="Records to skip")] = 0,
@@ -191,7 +230,9 @@ async def odoo_search_read_records(
     """
     client = get_odoo_client()
     try:
-        result = await client.search_read(model, domain, fields, limit, offset, order)
+        result = await client.search_read(
+            model, domain, _project_fields(model, fields), limit, offset, order
+        )
         return {
             "success": True,
             "records": result,
@@ -200,11 +241,7 @@ async def odoo_search_read_records(
         }
     except Exception as e:
         logger.error("search_read_error", model=model, error=str(e))
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Error searching and reading {model}"
-        }
+        return _error(e, f"Error searching and reading {model}")
 
 
 @mcp.tool()
@@ -239,11 +276,7 @@ async def odoo_create_record(
         }
     except Exception as e:
         logger.error("create_error", model=model, values=values, error=str(e))
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Error creating record in {model}"
-        }
+        return _error(e, f"Error creating record in {model}")
 
 
 @mcp.tool()
@@ -276,11 +309,7 @@ async def odoo_update_record(
         }
     except Exception as e:
         logger.error("update_error", model=model, ids=ids, values=values, error=str(e))
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Error updating records in {model}"
-        }
+        return _error(e, f"Error updating records in {model}")
 
 
 @mcp.tool()
@@ -311,11 +340,7 @@ async def odoo_delete_record(
         }
     except Exception as e:
         logger.error("delete_error", model=model, ids=ids, error=str(e))
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Error deleting records from {model}"
-        }
+        return _error(e, f"Error deleting records from {model}")
 
 
 @mcp.tool()
@@ -335,6 +360,16 @@ async def odoo_get_model_fields(
         Dictionary with success status and field definitions
     """
     client = get_odoo_client()
+    cache = client.cache_manager
+
+    # Negative cache: LLM exploration tends to retry a bad model name
+    # repeatedly; serve the remembered failure instead of a fresh RPC.
+    err_key = f"fields_err:{model}"
+    if cache:
+        cached_error = await cache.get(err_key)
+        if cached_error is not None:
+            return cached_error
+
     try:
         result = await client.get_fields(model)
         return {
@@ -345,8 +380,7 @@ async def odoo_get_model_fields(
         }
     except Exception as e:
         logger.error("get_fields_error", model=model, error=str(e))
-        return {
-            "success": False,
-            "error": str(e),
-            "message": f"Error getting fields for {model}"
-        }
+        error_payload = _error(e, f"Error getting fields for {model}")
+        if cache:
+            await cache.set(err_key, error_payload, ttl=60)
+        return error_payload
@@ -1,20 +1,49 @@
 """OAuth 2.0 implementation for ChatGPT and other OAuth clients."""
 
+import base64
+import heapq
+import hmac
 import secrets
 import hashlib
 import time
 import json
 from pathlib import Path
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Tuple
+from cachetools import TTLCache
+import redis
 import structlog
 
+from .config import get_settings
+
 logger = structlog.get_logger()
 
-# In-memory storage for OAuth (en producción usar Redis o DB)
+# In-memory storage for OAuth (shared across workers via Redis when enabled)
 oauth_codes: Dict[str, dict] = {}
 oauth_tokens: Dict[str, dict] = {}
 oauth_clients: Dict[str, dict] = {}  # Dynamic client registration
+# Índice inverso refresh_token -> access_token para refresh O(1)
+refresh_to_access: Dict[str, str] = {}
+# Min-heaps (expires_at, key) para limpiar expirados en O(expirados)
+codes_exp: List[Tuple[float, str]] = []
+tokens_exp: List[Tuple[float, str]] = []
+
+
+def _create_oauth_redis() -> Optional[redis.Redis]:
+    """Create the shared Redis client for OAuth state, if enabled.
+
+    With multiple uvicorn workers each process has its own oauth_tokens /
+    oauth_clients dicts; a token issued by one worker would be invalid on
+    the others. Redis acts as write-through storage so every worker sees
+    the same tokens and registered clients. The client is synchronous on
+    purpose: the OAuth endpoints already do synchronous JSON-file writes.
+    """
+    settings = get_settings()
+    if not settings.redis_enabled:
+        return None
+    return redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+
+oauth_redis = _create_oauth_redis()
 
 # Persistencia en archivos JSON
 OAUTH_CLIENTS_FILE = Path("oauth_clients.json")
@@ -56,7 +85,15 @@ def load_oauth_tokens():
                       if current_time > data.get("expires_at", 0)]
             for token in expired:
                 del oauth_tokens[token]
-            logger.info("oauth_tokens_loaded", total=len(oauth_tokens) + len(expired), 
+            # Reconstruir índice inverso y heap de expiración
+            refresh_to_access.clear()
+            tokens_exp.clear()
+            for token, data in oauth_tokens.items():
+                if data.get("refresh_token"):
+                    refresh_to_access[data["refresh_token"]] = token
+                tokens_exp.append((data.get("expires_at", 0), token))
+            heapq.heapify(tokens_exp)
+            logger.info("oauth_tokens_loaded", total=len(oauth_tokens) + len(expired),
                        active=len(oauth_tokens), expired=len(expired))
         except Exception as e:
             logger.error("oauth_tokens_load_error", error=str(e))
@@ -73,6 +110,161 @@ def save_oauth_tokens():
     except Exception as e:
         logger.error("oauth_tokens_save_error", error=str(e))
 
+def _k(token: str) -> str:
+    """Index key for a secret: SHA-256 hex digest.
+
+    Codes and tokens are stored under their hash so the dicts, the JSON
+    persistence file and Redis never hold the plaintext secret, lookups
+    compare fixed-size keys, and oversized bogus tokens cannot balloon
+    key storage.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def _token_pair() -> Tuple[str, str]:
+    """Generate an access/refresh token pair from one getrandom() call.
+
+    Equivalent to two secrets.token_urlsafe(48) calls but draws the 96
+    random bytes in a single syscall and slices them.
+    """
+    raw = secrets.token_bytes(96)
+    return (
+        base64.urlsafe_b64encode(raw[:48]).rstrip(b"=").decode(),
+        base64.urlsafe_b64encode(raw[48:]).rstrip(b"=").decode(),
+    )
+
+
+def _redis_store_code(code: str, data: dict, ttl: int):
+    """Write-through an authorization code to Redis with its native TTL."""
+    if oauth_redis is None:
+        return
+    try:
+        oauth_redis.set(f"oauth:code:{code}", json.dumps(data), ex=ttl)
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="store_code", error=str(e))
+
+
+def _redis_take_code(code: str) -> Optional[dict]:
+    """Atomically fetch-and-delete a code issued by another worker.
+
+    GETDEL (Redis >= 6.2) redeems in one command; a GET/DELETE pair would
+    let two workers both redeem the same code in the race window, breaking
+    one-time use.
+    """
+    if oauth_redis is None:
+        return None
+    try:
+        raw = oauth_redis.getdel(f"oauth:code:{code}")
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="take_code", error=str(e))
+        return None
+
+
+def _redis_delete_code(code: str):
+    """Remove a consumed authorization code from Redis."""
+    if oauth_redis is None:
+        return
+    try:
+        oauth_redis.delete(f"oauth:code:{code}")
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="delete_code", error=str(e))
+
+
+def _redis_store_token(token: str, data: dict):
+    """Write-through a token to Redis with its remaining lifetime as TTL."""
+    if oauth_redis is None:
+        return
+    try:
+        ttl = max(1, int(data["expires_at"] - time.time()))
+        oauth_redis.set(f"oauth:token:{token}", json.dumps(data), ex=ttl)
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="store_token", error=str(e))
+
+
+def _redis_delete_token(token: str):
+    """Remove a token from Redis (revocation / rotation)."""
+    if oauth_redis is None:
+        return
+    try:
+        oauth_redis.delete(f"oauth:token:{token}")
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="delete_token", error=str(e))
+
+
+def _redis_load_token(token: str) -> Optional[dict]:
+    """Fetch a token issued by another worker, if Redis is enabled."""
+    if oauth_redis is None:
+        return None
+    try:
+        raw = oauth_redis.get(f"oauth:token:{token}")
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="load_token", error=str(e))
+        return None
+
+
+def _redis_store_refresh(refresh_key: str, token_key: str, expires_at: float):
+    """Write-through the refresh -> access index with the token's TTL.
+
+    Without this, a refresh request landing on a worker that never saw the
+    token fails even though the token itself is in Redis: refresh usually
+    happens after expiry, so validate_token-driven hydration can't help.
+    """
+    if oauth_redis is None:
+        return
+    try:
+        ttl = max(1, int(expires_at - time.time()))
+        oauth_redis.set(f"oauth:refresh:{refresh_key}", token_key, ex=ttl)
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="store_refresh", error=str(e))
+
+
+def _redis_load_refresh(refresh_key: str) -> Optional[str]:
+    """Resolve a refresh hash minted on another worker to its token key."""
+    if oauth_redis is None:
+        return None
+    try:
+        return oauth_redis.get(f"oauth:refresh:{refresh_key}")
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="load_refresh", error=str(e))
+        return None
+
+
+def _redis_delete_refresh(refresh_key: Optional[str]):
+    """Remove a refresh index entry (rotation / token expiry)."""
+    if oauth_redis is None or not refresh_key:
+        return
+    try:
+        oauth_redis.delete(f"oauth:refresh:{refresh_key}")
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="delete_refresh", error=str(e))
+
+
+def _redis_store_client(client_data: dict):
+    """Write-through a registered client to Redis."""
+    if oauth_redis is None:
+        return
+    try:
+        oauth_redis.set(
+            f"oauth:client:{client_data['client_id']}", json.dumps(client_data)
+        )
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="store_client", error=str(e))
+
+
+def _redis_load_client(client_id: str) -> Optional[dict]:
+    """Fetch a client registered on another worker, if Redis is enabled."""
+    if oauth_redis is None:
+        return None
+    try:
+        raw = oauth_redis.get(f"oauth:client:{client_id}")
+        return json.loads(raw) if raw else None
+    except Exception as e:
+        logger.error("oauth_redis_error", operation="load_client", error=str(e))
+        return None
+
+
 # Cargar clientes y tokens al iniciar
 load_oauth_clients()
 load_oauth_tokens()
@@ -86,6 +278,19 @@ class OAuthManager:
         self.client_secret = client_secret or secrets.token_urlsafe(32)
         self.code_expiry_seconds = 600  # 10 minutos
         self.token_expiry_seconds = 3600 * 24  # 24 horas
+        # Client metadata rarely changes; a short TTL cache absorbs the
+        # repeated lookups that /oauth/token performs per exchange.
+        self._client_cache: TTLCache = TTLCache(maxsize=1024, ttl=300)
+        # El cliente estático nunca cambia: construirlo una sola vez
+        self._static_client: Dict[str, Any] = {
+            "client_id": self.client_id,
+            "client_secret": self.client_secret,
+            "redirect_uris": [
+                "https://chatgpt.com/oauth/callback",
+                "https://chat.openai.com/oauth/callback"
+            ],
+            "token_endpoint_auth_method": "client_secret_basic"
+        }
         
     def generate_authorization_code(
         self, 
@@ -109,17 +314,21 @@ class OAuthManager:
         
         # Generar código de autorización único
         code = secrets.token_urlsafe(32)
-        
-        # Almacenar código con metadata
-        oauth_codes[code] = {
+        code_key = _k(code)
+
+        # Almacenar código con metadata (indexado por hash, nunca en claro)
+        now = time.time()
+        oauth_codes[code_key] = {
             "client_id": client_id,
             "redirect_uri": redirect_uri,
             "state": state,
             "scope": scope or "odoo:read odoo:write",
-            "created_at": time.time(),
-            "expires_at": time.time() + self.code_expiry_seconds
+            "created_at": now,
+            "expires_at": now + self.code_expiry_seconds
         }
-        
+        heapq.heappush(codes_exp, (oauth_codes[code_key]["expires_at"], code_key))
+        _redis_store_code(code_key, oauth_codes[code_key], self.code_expiry_seconds)
+
         logger.info(
             "authorization_code_generated",
             code=code[:10] + "...",
@@ -138,16 +347,23 @@ class OAuthManager:
     ) -> Dict[str, Any]:
         """Exchange authorization code for access token."""
         
-        # Validar código existe
-        if code not in oauth_codes:
+        # Canjear el código. Con Redis activo, GETDEL es la única fuente de
+        # verdad: el dict local del worker emisor es solo caché y servir
+        # desde él permitiría un doble canje concurrente en dos workers.
+        code_key = _k(code)
+        if oauth_redis is not None:
+            code_data = _redis_take_code(code_key)
+            oauth_codes.pop(code_key, None)
+        else:
+            code_data = oauth_codes.get(code_key)
+        if code_data is None:
             logger.warning("invalid_authorization_code", code=code[:10] + "...")
             raise ValueError("Invalid authorization code")
         
-        code_data = oauth_codes[code]
-        
-        # Validar código no expirado
+        # Validar código no expirado (ya retirado de Redis por el GETDEL)
         if time.time() > code_data["expires_at"]:
-            del oauth_codes[code]
+            oauth_codes.pop(code_key, None)
+            _redis_delete_code(code_key)
             logger.warning("expired_authorization_code", code=code[:10] + "...")
             raise ValueError("Authorization code expired")
         
@@ -165,7 +381,10 @@ class OAuthManager:
         # Validar client_secret (solo para clientes confidenciales)
         if client.get("token_endpoint_auth_method") != "none":
             expected_secret = client.get("client_secret")
-            if client_secret != expected_secret:
+            # Comparar como bytes: compare_digest rechaza str no-ASCII
+            if not (client_secret and expected_secret
+                    and hmac.compare_digest(
+                        client_secret.encode(), expected_secret.encode())):
                 logger.warning("invalid_client_secret")
                 raise ValueError("Invalid client secret")
         
@@ -175,21 +394,28 @@ class OAuthManager:
             raise ValueError("Redirect URI mismatch")
         
         # Generar access token
-        access_token = secrets.token_urlsafe(48)
-        refresh_token = secrets.token_urlsafe(48)
-        
-        # Almacenar token
-        oauth_tokens[access_token] = {
+        access_token, refresh_token = _token_pair()
+        token_key = _k(access_token)
+        refresh_key = _k(refresh_token)
+
+        # Almacenar token (solo hashes; el cliente recibe el único plaintext)
+        now = time.time()
+        oauth_tokens[token_key] = {
             "client_id": client_id,
             "scope": code_data["scope"],
-            "created_at": time.time(),
-            "expires_at": time.time() + self.token_expiry_seconds,
-            "refresh_token": refresh_token
+            "created_at": now,
+            "expires_at": now + self.token_expiry_seconds,
+            "refresh_token": refresh_key
         }
-        
-        # Eliminar código usado (one-time use)
-        del oauth_codes[code]
-        
+        refresh_to_access[refresh_key] = token_key
+        heapq.heappush(tokens_exp, (oauth_tokens[token_key]["expires_at"], token_key))
+        _redis_store_token(token_key, oauth_tokens[token_key])
+        _redis_store_refresh(refresh_key, token_key, oauth_tokens[token_key]["expires_at"])
+
+        # Eliminar código usado (one-time use; con Redis ya se retiró arriba)
+        oauth_codes.pop(code_key, None)
+        _redis_delete_code(code_key)
+
         # Persistir tokens
         save_oauth_tokens()
         
@@ -210,16 +436,26 @@ class OAuthManager:
     
     def validate_token(self, access_token: str) -> bool:
         """Validate OAuth access token."""
-        
-        if access_token not in oauth_tokens:
-            logger.warning("invalid_access_token", token=access_token[:10] + "...")
-            return False
-        
-        token_data = oauth_tokens[access_token]
-        
+
+        token_key = _k(access_token)
+        token_data = oauth_tokens.get(token_key)
+        if token_data is None:
+            # Tal vez fue emitido por otro worker: consultar Redis
+            token_data = _redis_load_token(token_key)
+            if token_data is None:
+                logger.warning("invalid_access_token", token=access_token[:10] + "...")
+                return False
+            oauth_tokens[token_key] = token_data
+            if token_data.get("refresh_token"):
+                refresh_to_access[token_data["refresh_token"]] = token_key
+            heapq.heappush(tokens_exp, (token_data.get("expires_at", 0), token_key))
+
         # Verificar expiración
         if time.time() > token_data["expires_at"]:
-            del oauth_tokens[access_token]
+            del oauth_tokens[token_key]
+            refresh_to_access.pop(token_data.get("refresh_token"), None)
+            _redis_delete_token(token_key)
+            _redis_delete_refresh(token_data.get("refresh_token"))
             save_oauth_tokens()  # Persistir eliminación
             logger.warning("expired_access_token", token=access_token[:10] + "...")
             return False
@@ -235,17 +471,31 @@ class OAuthManager:
     ) -> Dict[str, Any]:
         """Refresh access token using refresh token."""
         
-        # Buscar token por refresh_token
-        old_token = None
-        for token, data in oauth_tokens.items():
-            if data.get("refresh_token") == refresh_token:
-                old_token = token
-                break
-        
+        # Buscar token por refresh_token (índice inverso O(1), claves hasheadas)
+        refresh_key = _k(refresh_token)
+        old_token = refresh_to_access.get(refresh_key)
+        if old_token is not None and old_token not in oauth_tokens:
+            refresh_to_access.pop(refresh_key, None)
+            old_token = None
+
+        if old_token is None:
+            # Tal vez fue emitido por otro worker: consultar índice en Redis
+            old_token = _redis_load_refresh(refresh_key)
+            if old_token is not None:
+                token_data = _redis_load_token(old_token)
+                if token_data is None:
+                    old_token = None
+                else:
+                    oauth_tokens[old_token] = token_data
+                    refresh_to_access[refresh_key] = old_token
+                    heapq.heappush(
+                        tokens_exp, (token_data.get("expires_at", 0), old_token)
+                    )
+
         if not old_token:
             logger.warning("invalid_refresh_token")
             raise ValueError("Invalid refresh token")
-        
+
         token_data = oauth_tokens[old_token]
         
         # Validar client_id
@@ -262,25 +512,41 @@ class OAuthManager:
         # Validar client_secret (solo para clientes confidenciales)
         if client.get("token_endpoint_auth_method") != "none":
             expected_secret = client.get("client_secret")
-            if client_secret != expected_secret:
+            # Comparar como bytes: compare_digest rechaza str no-ASCII
+            if not (client_secret and expected_secret
+                    and hmac.compare_digest(
+                        client_secret.encode(), expected_secret.encode())):
                 logger.warning("invalid_client_secret_on_refresh")
                 raise ValueError("Invalid client secret")
         
         # Generar nuevo access token
-        new_access_token = secrets.token_urlsafe(48)
-        new_refresh_token = secrets.token_urlsafe(48)
-        
+        new_access_token, new_refresh_token = _token_pair()
+        new_token_key = _k(new_access_token)
+        new_refresh_key = _k(new_refresh_token)
+
         # Almacenar nuevo token
-        oauth_tokens[new_access_token] = {
+        now = time.time()
+        oauth_tokens[new_token_key] = {
             "client_id": client_id,
             "scope": token_data["scope"],
-            "created_at": time.time(),
-            "expires_at": time.time() + self.token_expiry_seconds,
-            "refresh_token": new_refresh_token
+            "created_at": now,
+            "expires_at": now + self.token_expiry_seconds,
+            "refresh_token": new_refresh_key
         }
-        
-        # Eliminar token anterior
+        refresh_to_access[new_refresh_key] = new_token_key
+        heapq.heappush(
+            tokens_exp, (oauth_tokens[new_token_key]["expires_at"], new_token_key)
+        )
+        _redis_store_token(new_token_key, oauth_tokens[new_token_key])
+        _redis_store_refresh(
+            new_refresh_key, new_token_key, oauth_tokens[new_token_key]["expires_at"]
+        )
+
+        # Eliminar token anterior (rotación: el refresh viejo deja de valer)
         del oauth_tokens[old_token]
+        refresh_to_access.pop(refresh_key, None)
+        _redis_delete_token(old_token)
+        _redis_delete_refresh(refresh_key)
         
         # Persistir cambios
         save_oauth_tokens()
@@ -339,7 +605,9 @@ class OAuthManager:
         }
         
         oauth_clients[client_id] = client_data
-        
+        self._client_cache.pop(client_id, None)
+        _redis_store_client(client_data)
+
         # Guardar en disco para persistencia
         save_oauth_clients()
         
@@ -369,20 +637,24 @@ class OAuthManager:
     
     def get_client(self, client_id: str) -> Optional[Dict[str, Any]]:
         """Obtener datos de un cliente (estático o dinámico)."""
-        # Cliente estático predeterminado
+        # Cliente estático predeterminado: pre-construido, sin caché ni TTL
         if client_id == self.client_id:
-            return {
-                "client_id": self.client_id,
-                "client_secret": self.client_secret,
-                "redirect_uris": [
-                    "https://chatgpt.com/oauth/callback",
-                    "https://chat.openai.com/oauth/callback"
-                ],
-                "token_endpoint_auth_method": "client_secret_basic"
-            }
-        
-        # Cliente dinámico
-        return oauth_clients.get(client_id)
+            return self._static_client
+
+        cached = self._client_cache.get(client_id)
+        if cached is not None:
+            return cached
+
+        # Cliente dinámico (local, o registrado por otro worker vía Redis)
+        client = oauth_clients.get(client_id)
+        if client is None:
+            client = _redis_load_client(client_id)
+            if client is not None:
+                oauth_clients[client_id] = client
+
+        if client is not None:
+            self._client_cache[client_id] = client
+        return client
     
     def get_client_credentials(self) -> Dict[str, str]:
         """Get OAuth client credentials for setup."""
@@ -392,30 +664,39 @@ class OAuthManager:
         }
     
     def cleanup_expired(self):
-        """Clean up expired codes and tokens."""
+        """Clean up expired codes and tokens.
+
+        The expiry heaps make each sweep O(expired) instead of rescanning
+        every live entry, so it can run frequently without CPU cost.
+        """
         current_time = time.time()
-        
+
         # Limpiar códigos expirados
-        expired_codes = [
-            code for code, data in oauth_codes.items()
-            if current_time > data["expires_at"]
-        ]
-        for code in expired_codes:
-            del oauth_codes[code]
-        
+        expired_codes = 0
+        while codes_exp and codes_exp[0][0] < current_time:
+            _, code = heapq.heappop(codes_exp)
+            data = oauth_codes.get(code)
+            # La entrada puede haber sido consumida (one-time use)
+            if data is not None and current_time > data["expires_at"]:
+                del oauth_codes[code]
+                expired_codes += 1
+
         # Limpiar tokens expirados
-        expired_tokens = [
-            token for token, data in oauth_tokens.items()
-            if current_time > data["expires_at"]
-        ]
-        for token in expired_tokens:
-            del oauth_tokens[token]
-        
+        expired_tokens = 0
+        while tokens_exp and tokens_exp[0][0] < current_time:
+            _, token = heapq.heappop(tokens_exp)
+            data = oauth_tokens.get(token)
+            # La entrada puede haber sido rotada vía refresh
+            if data is not None and current_time > data["expires_at"]:
+                refresh_to_access.pop(data.get("refresh_token"), None)
+                del oauth_tokens[token]
+                expired_tokens += 1
+
         if expired_codes or expired_tokens:
             logger.info(
                 "oauth_cleanup",
-                expired_codes=len(expired_codes),
-                expired_tokens=len(expired_tokens)
+                expired_codes=expired_codes,
+                expired_tokens=expired_tokens
             )
 
 
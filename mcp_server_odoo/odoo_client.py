@@ -1,10 +1,15 @@
 """Enhanced Odoo client with error handling and retries."""
 
+import asyncio
+import hashlib
+import itertools
+import random
 import xmlrpc.client
-import ssl
 from typing import Any, Dict, List, Optional, Union
+import httpx
+import orjson
 import structlog
-from time import sleep
+from time import monotonic, sleep
 
 from .config import Settings
 from .cache import CacheManager
@@ -12,6 +17,36 @@ from .cache import CacheManager
 logger = structlog.get_logger()
 
 
+def _digest(value: Any) -> str:
+    """Short stable digest of a structured argument for cache keys.
+
+    str(domain) produces keys as long as the domain itself and depends on
+    Python repr quirks; a canonical-JSON BLAKE2b digest is 32 hex chars
+    regardless of domain size and stable across dict orderings.
+    """
+    return hashlib.blake2b(
+        orjson.dumps(value, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+
+class _LogRepr:
+    """Lazy bounded repr for log fields.
+
+    The filtering bound logger drops below-level events before rendering,
+    so wrapping a payload in this costs one small allocation when DEBUG is
+    off; when DEBUG is on, the repr of a multi-megabyte domain or write
+    batch is truncated instead of dominating the call.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __repr__(self) -> str:
+        s = repr(self.value)
+        return s if len(s) <= 512 else s[:512] + "...(truncated)"
+
+
 class OdooClientError(Exception):
     """Base exception for Odoo client errors."""
     pass
@@ -29,11 +64,13 @@ class OdooConnectionError(OdooClientError):
 
 class OdooClient:
     """
-    Enhanced Odoo XML-RPC client with:
+    Enhanced Odoo RPC client with:
+    - XML-RPC or JSON-RPC transport (ODOO_TRANSPORT setting), both over a
+      shared keep-alive connection pool
     - Automatic retries with exponential backoff
     - Better error handling and logging
     - Optional caching for read operations
-    - SSL support
+    - SSL support (certificates verified by httpx)
     """
     
     def __init__(self, settings: Settings, cache_manager: Optional[CacheManager] = None):
@@ -45,48 +82,125 @@ class OdooClient:
         self.password = settings.odoo_password
         self.timeout = settings.odoo_timeout
         self.max_retries = settings.odoo_max_retries
-        
+        self.transport = settings.odoo_transport
+
         self._uid: Optional[int] = None
-        self._common_proxy = None
-        self._object_proxy = None
-        
-        logger.info("odoo_client_initialized", url=self.url, db=self.db)
-    
-    def _get_ssl_context(self) -> ssl.SSLContext:
-        """Create SSL context for secure connections."""
-        context = ssl.create_default_context()
-        context.check_hostname = True
-        context.verify_mode = ssl.CERT_REQUIRED
-        return context
-    
-    def _get_proxy(self, endpoint: str):
-        """Get XML-RPC proxy for an endpoint."""
-        url = f"{self.url}/xmlrpc/2/{endpoint}"
-        
-        if self.url.startswith('https'):
-            context = self._get_ssl_context()
-            return xmlrpc.client.ServerProxy(
-                url,
-                context=context,
-                allow_none=True
-            )
-        else:
-            return xmlrpc.client.ServerProxy(url, allow_none=True)
-    
+        # Re-authenticate after this monotonic deadline even if _uid is set,
+        # so a uid that went stale (Odoo restart, session rotation) heals
+        # itself instead of failing every call until a process restart.
+        self._uid_expires_at: float = 0.0
+        self._http_client: Optional[httpx.Client] = None
+        self._jsonrpc_id = itertools.count(1)
+        # Monotonic timestamp of the last successful RPC; lets /health treat
+        # a connection with recent traffic as known-good without probing.
+        self.last_ok: float = 0.0
+        # In-flight read-only calls keyed by cache key, so concurrent
+        # identical requests share one RPC instead of issuing N.
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # model -> (fetched_at, fields) memo so repeat schema lookups skip
+        # even the Redis round-trip; field definitions only change on
+        # module upgrades.
+        self._fields_memo: Dict[str, tuple] = {}
+        # Bound concurrent RPCs so tool-call bursts don't exhaust the
+        # thread pool or overwhelm the Odoo worker limit.
+        self._rpc_semaphore = asyncio.Semaphore(settings.odoo_max_concurrency)
+
+        logger.info(
+            "odoo_client_initialized", url=self.url, db=self.db, transport=self.transport
+        )
+
+    async def _run_rpc(self, *args, **kwargs) -> Any:
+        """Run execute_kw off the event loop, bounded by the RPC semaphore."""
+        async with self._rpc_semaphore:
+            return await asyncio.to_thread(self.execute_kw, *args, **kwargs)
+
     @property
-    def common(self):
-        """Get common proxy."""
-        if not self._common_proxy:
-            self._common_proxy = self._get_proxy('common')
-        return self._common_proxy
-    
+    def uid(self) -> Optional[int]:
+        """Authenticated user ID, or None before the first authenticate()."""
+        return self._uid
+
     @property
-    def models(self):
-        """Get object/models proxy."""
-        if not self._object_proxy:
-            self._object_proxy = self._get_proxy('object')
-        return self._object_proxy
-    
+    def http(self) -> httpx.Client:
+        """Get the shared HTTP client used for both RPC transports.
+
+        One client per OdooClient so every call reuses pooled keep-alive
+        connections instead of paying a TCP/TLS handshake per request.
+        """
+        if self._http_client is None:
+            self._http_client = httpx.Client(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_keepalive_connections=50,
+                    max_connections=200,
+                    # Idle connections older than this are likely to have been
+                    # dropped by Odoo/proxies anyway; recycle them proactively
+                    # instead of paying a failed send + retry.
+                    keepalive_expiry=30.0
+                )
+            )
+        return self._http_client
+
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+
+    def _xmlrpc_call(self, endpoint: str, method: str, args: List) -> Any:
+        """Call an Odoo XML-RPC endpoint over the pooled HTTP client.
+
+        xmlrpc.client.ServerProxy opens a fresh connection per call; encoding
+        the request with xmlrpc.client.dumps and posting it through httpx
+        keeps XML-RPC on the same keep-alive pool as JSON-RPC.
+        """
+        body = xmlrpc.client.dumps(tuple(args), methodname=method, allow_none=True)
+
+        response = self.http.post(
+            f"{self.url}/xmlrpc/2/{endpoint}",
+            content=body.encode(),
+            headers={"Content-Type": "text/xml"}
+        )
+        response.raise_for_status()
+
+        # loads() raises xmlrpc.client.Fault for fault responses.
+        params, _ = xmlrpc.client.loads(response.text)
+        return params[0]
+
+    def _jsonrpc_call(self, service: str, method: str, args: List) -> Any:
+        """Call Odoo's /jsonrpc endpoint (same API surface as XML-RPC)."""
+        payload = orjson.dumps({
+            "jsonrpc": "2.0",
+            "method": "call",
+            "params": {"service": service, "method": method, "args": args},
+            "id": next(self._jsonrpc_id)
+        })
+
+        response = self.http.post(
+            f"{self.url}/jsonrpc",
+            content=payload,
+            headers={"Content-Type": "application/json"}
+        )
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        if data.get("error"):
+            raise OdooClientError(str(data["error"]))
+        return data.get("result")
+
+    async def _single_flight(self, key: str, make_call) -> Any:
+        """Coalesce concurrent identical read-only calls into one RPC.
+
+        An LLM commonly fires the same lookup (schema discovery, repeated
+        reads) several times back-to-back; waiters attach to the task that
+        is already in flight and share its result.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(make_call())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
     def _retry_with_backoff(self, func, *args, **kwargs):
         """Execute function with retry logic and exponential backoff."""
         last_error: Exception = Exception("No attempts made")
@@ -97,7 +211,10 @@ class OdooClient:
             except Exception as e:
                 last_error = e
                 if attempt < self.max_retries - 1:
-                    wait_time = 2 ** attempt
+                    # Jittered exponential backoff: desynchronize retries so
+                    # concurrent callers don't hammer a recovering Odoo in
+                    # lockstep.
+                    wait_time = (2 ** attempt) * (0.5 + random.random())
                     logger.warning(
                         "retrying_odoo_call",
                         attempt=attempt + 1,
@@ -125,18 +242,18 @@ class OdooClient:
         Raises:
             OdooAuthenticationError: If authentication fails
         """
-        if self._uid:
+        if self._uid and monotonic() < self._uid_expires_at:
             return self._uid
         
         try:
             logger.info("authenticating_with_odoo", username=self.username)
             
+            call = self._jsonrpc_call if self.transport == "jsonrpc" else self._xmlrpc_call
             uid = self._retry_with_backoff(
-                self.common.authenticate,
-                self.db,
-                self.username,
-                self.password,
-                {}
+                call,
+                'common',
+                'authenticate',
+                [self.db, self.username, self.password, {}]
             )
             
             if not uid:
@@ -145,6 +262,8 @@ class OdooClient:
                 )
             
             self._uid = int(uid)
+            self._uid_expires_at = monotonic() + 3600
+            self.last_ok = monotonic()
             logger.info("authentication_successful", uid=int(uid))
             return int(uid)
             
@@ -184,21 +303,35 @@ class OdooClient:
                 "executing_odoo_method",
                 model=model,
                 method=method,
-                args=args,
-                kwargs=kwargs
-            )
-            
-            result = self._retry_with_backoff(
-                self.models.execute_kw,
-                self.db,
-                uid,
-                self.password,
-                model,
-                method,
-                args,
-                kwargs
+                args=_LogRepr(args),
+                kwargs=_LogRepr(kwargs)
             )
             
+            call = self._jsonrpc_call if self.transport == "jsonrpc" else self._xmlrpc_call
+            try:
+                result = self._retry_with_backoff(
+                    call,
+                    'object',
+                    'execute_kw',
+                    [self.db, uid, self.password, model, method, args, kwargs]
+                )
+            except Exception as e:
+                # A stale uid (Odoo restart, rotated session) surfaces as an
+                # access fault; drop the cached uid, re-auth and retry once.
+                fault = str(e).lower()
+                if "accessdenied" not in fault and "session expired" not in fault:
+                    raise
+                logger.warning("stale_uid_reauthenticating", model=model, method=method)
+                self._uid = None
+                uid = self.authenticate()
+                result = self._retry_with_backoff(
+                    call,
+                    'object',
+                    'execute_kw',
+                    [self.db, uid, self.password, model, method, args, kwargs]
+                )
+
+            self.last_ok = monotonic()
             logger.debug("odoo_method_success", model=model, method=method)
             return result
             
@@ -211,6 +344,39 @@ class OdooClient:
             )
             raise OdooClientError(f"Error calling {model}.{method}: {str(e)}")
     
+    async def batch_execute_kw(
+        self, calls: List[tuple]
+    ) -> List[Union[Any, OdooClientError]]:
+        """
+        Execute several independent calls concurrently.
+
+        Odoo's object-service dispatcher only accepts execute/execute_kw —
+        it never implemented the system.multicall extension — so batching
+        overlaps the calls on the shared keep-alive pool (bounded by the
+        RPC semaphore) instead of bundling them into one envelope. Wall
+        time for K calls approaches the slowest call rather than the sum.
+
+        Args:
+            calls: List of (model, method, args, kwargs) tuples
+
+        Returns:
+            Per-call results in order; a failed call yields an
+            OdooClientError instance in its slot instead of raising.
+        """
+        if not calls:
+            return []
+
+        results = await asyncio.gather(
+            *(self._run_rpc(model, method, args, kwargs)
+              for model, method, args, kwargs in calls),
+            return_exceptions=True
+        )
+        return [
+            r if not isinstance(r, BaseException)
+            else r if isinstance(r, OdooClientError) else OdooClientError(str(r))
+            for r in results
+        ]
+
     async def search(
         self,
         model: str,
@@ -243,17 +409,20 @@ class OdooClient:
         cache_key = None
         if self.cache_manager and limit and limit <= 100:
             cache_key = self.cache_manager._make_key(
-                "search", model, str(domain), str(limit), str(offset), str(order)
+                "search", model, _digest(domain), str(limit), str(offset), str(order)
             )
-            cached = await self.cache_manager.get(cache_key)
+            cached = await self.cache_manager.get(cache_key, tag=model)
             if cached is not None:
                 return cached
         
-        result = self.execute_kw(model, 'search', [domain], kwargs)
-        
-        if cache_key:
-            await self.cache_manager.set(cache_key, result)
-        
+        start = monotonic()
+        result = await self._run_rpc(model, 'search', [domain], kwargs)
+
+        # Only spend cache capacity on searches that were actually slow;
+        # caching sub-50ms lookups mostly evicts more valuable entries.
+        if cache_key and monotonic() - start >= 0.05:
+            await self.cache_manager.set(cache_key, result, tag=model)
+
         return result
     
     async def read(
@@ -276,8 +445,24 @@ class OdooClient:
         kwargs = {}
         if fields:
             kwargs['fields'] = fields
-        
-        return self.execute_kw(model, 'read', [ids], kwargs)
+
+        key = ":".join(("read", model, _digest(ids), _digest(fields)))
+        if self.cache_manager:
+            cached = await self.cache_manager.get(key, tag=model)
+            if cached is not None:
+                return cached
+
+        result = await self._single_flight(
+            key,
+            lambda: self._run_rpc(model, 'read', [ids], kwargs)
+        )
+
+        # Records are mutable, so keep the TTL short: long enough to absorb
+        # the repeated reads an agent fires within one conversation turn.
+        if self.cache_manager:
+            await self.cache_manager.set(key, result, ttl=60, tag=model)
+
+        return result
     
     async def search_read(
         self,
@@ -311,9 +496,61 @@ class OdooClient:
             kwargs['limit'] = limit
         if order:
             kwargs['order'] = order
-        
-        return self.execute_kw(model, 'search_read', [domain], kwargs)
+
+        cache_key = None
+        if self.cache_manager and limit and limit <= 100:
+            cache_key = self.cache_manager._make_key(
+                "sr", model, _digest(domain), _digest(fields),
+                str(limit), str(offset), str(order)
+            )
+            cached = await self.cache_manager.get(cache_key, tag=model)
+            if cached is not None:
+                return cached
+
+        result = await self._run_rpc(model, 'search_read', [domain], kwargs)
+
+        # Same short TTL as read(): result sets are mutable data.
+        if cache_key:
+            await self.cache_manager.set(cache_key, result, ttl=60, tag=model)
+
+        return result
     
+    async def search_read_columnar(
+        self,
+        model: str,
+        domain: Optional[List] = None,
+        fields: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        order: Optional[str] = None
+    ) -> Dict[str, List]:
+        """
+        search_read returning columns instead of one dict per row.
+
+        For bulk responses the row-dict form pays per-row hashtable
+        overhead on identical keys; {field: [values...]} stores each key
+        once, which matters when callers go on to project a few columns.
+
+        Args:
+            Same as search_read; fields is required in practice, since
+            columns are keyed by the requested field names.
+
+        Returns:
+            Dictionary mapping field name to the list of values, row-aligned
+            across fields ('id' is always included).
+        """
+        rows = await self.search_read(model, domain, fields, limit, offset, order)
+        if not rows:
+            return {}
+
+        # Odoo always returns 'id'; derive columns from the first row so the
+        # caller gets whatever projection the server actually applied.
+        columns: Dict[str, List] = {field: [] for field in rows[0]}
+        for row in rows:
+            for field, values in columns.items():
+                values.append(row.get(field))
+        return columns
+
     async def create(self, model: str, values: Dict) -> int:
         """
         Create a record in Odoo.
@@ -325,7 +562,10 @@ class OdooClient:
         Returns:
             ID of created record
         """
-        return self.execute_kw(model, 'create', [values])
+        result = await self._run_rpc(model, 'create', [values])
+        if self.cache_manager:
+            await self.cache_manager.invalidate_tag(model)
+        return result
     
     async def write(self, model: str, ids: List[int], values: Dict) -> bool:
         """
@@ -339,7 +579,10 @@ class OdooClient:
         Returns:
             True if successful
         """
-        return self.execute_kw(model, 'write', [ids, values])
+        result = await self._run_rpc(model, 'write', [ids, values])
+        if self.cache_manager:
+            await self.cache_manager.invalidate_tag(model)
+        return result
     
     async def unlink(self, model: str, ids: List[int]) -> bool:
         """
@@ -352,7 +595,10 @@ class OdooClient:
         Returns:
             True if successful
         """
-        return self.execute_kw(model, 'unlink', [ids])
+        result = await self._run_rpc(model, 'unlink', [ids])
+        if self.cache_manager:
+            await self.cache_manager.invalidate_tag(model)
+        return result
     
     async def get_fields(self, model: str) -> Dict[str, Any]:
         """
@@ -364,16 +610,27 @@ class OdooClient:
         Returns:
             Dictionary of field definitions
         """
+        memo = self._fields_memo.get(model)
+        if memo and monotonic() - memo[0] < 3600:
+            return memo[1]
+
         cache_key = None
         if self.cache_manager:
             cache_key = self.cache_manager._make_key("fields", model)
             cached = await self.cache_manager.get(cache_key)
             if cached is not None:
+                self._fields_memo[model] = (monotonic(), cached)
                 return cached
-        
-        result = self.execute_kw(model, 'fields_get', [], {'attributes': ['string', 'type', 'help']})
-        
+
+        result = await self._single_flight(
+            f"fields:{model}",
+            lambda: self._run_rpc(
+                model, 'fields_get', [], {'attributes': ['string', 'type', 'help']}
+            )
+        )
+
+        self._fields_memo[model] = (monotonic(), result)
         if cache_key:
             await self.cache_manager.set(cache_key, result, ttl=3600)
-        
+
         return result
@@ -20,10 +20,17 @@ async def run_stdio_server():
     
     settings = get_settings()
     
-    cache_manager = CacheManager(ttl=settings.cache_ttl)
+    cache_manager = CacheManager(ttl=settings.cache_ttl, maxsize=settings.local_cache_max)
     
     odoo_client = OdooClient(settings, cache_manager)
-    
+
+    # Pre-warm authentication so the first tool call doesn't pay auth latency.
+    try:
+        await asyncio.to_thread(odoo_client.authenticate)
+    except Exception as e:
+        logger.warning("startup_authentication_failed", error=str(e))
+
+
     server = Server("odoo-mcp-server")
     
     @server.list_tools()
@@ -1,29 +1,28 @@
 """MCP tools for Odoo with enhanced LLM-friendly descriptions."""
 
-from typing import Any, Dict, List, Optional
+import os
+from typing import Any, Dict, List, Optional, Tuple
 from mcp.types import Tool, TextContent
 import structlog
-import json
+import orjson
 
-from .odoo_client import OdooClient
+from .odoo_client import OdooClient, _LogRepr
 
 logger = structlog.get_logger()
 
+# Pretty-printing is debug-only: the indentation whitespace inflates tool
+# payloads severalfold and the LLM consumer doesn't need it. Set MCP_PRETTY=1
+# when reading responses by eye.
+_JSON_OPTS = orjson.OPT_INDENT_2 if os.getenv("MCP_PRETTY") else 0
 
-def get_tools() -> List[Tool]:
-    """
-    Get all available MCP tools with detailed, LLM-friendly descriptions.
-    
-    Each tool includes:
-    - Clear, concise description
-    - Detailed parameter explanations
-    - Usage examples in descriptions
-    - Common error scenarios
-    """
-    return [
-        Tool(
-            name="odoo_search_records",
-            description="""Search for records in any Odoo model using domain filters.
+
+# Built once at import: the definitions are static, and rebuilding seven
+# Tool models (multi-KB descriptions + schema validation) on every
+# list_tools call is pure waste.
+_TOOLS: Tuple[Tool, ...] = (
+    Tool(
+        name="odoo_search_records",
+        description="""Search for records in any Odoo model using domain filters.
 
 This tool allows you to find records in Odoo models like customers (res.partner), 
 sales orders (sale.order), products (product.product), invoices (account.move), etc.
@@ -57,40 +56,40 @@ Example usage:
 - Find customers named John: model='res.partner', domain=[['name', 'ilike', 'john']]
 - Find unpaid invoices: model='account.move', domain=[['state', '=', 'posted'], ['payment_state', '=', 'not_paid']]
 - Get recent sales orders: model='sale.order', order='create_date desc', limit=5""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {
-                        "type": "string",
-                        "description": "Odoo model name (e.g., 'res.partner', 'sale.order', 'product.product')"
-                    },
-                    "domain": {
-                        "type": "array",
-                        "description": "Search domain as list of tuples [['field', 'operator', 'value']]",
-                        "default": []
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of records to return",
-                        "default": 10
-                    },
-                    "offset": {
-                        "type": "integer",
-                        "description": "Number of records to skip (for pagination)",
-                        "default": 0
-                    },
-                    "order": {
-                        "type": "string",
-                        "description": "Sort order (e.g., 'name asc', 'create_date desc')",
-                        "default": None
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {
+                    "type": "string",
+                    "description": "Odoo model name (e.g., 'res.partner', 'sale.order', 'product.product')"
+                },
+                "domain": {
+                    "type": "array",
+                    "description": "Search domain as list of tuples [['field', 'operator', 'value']]",
+                    "default": []
                 },
-                "required": ["model"]
-            }
-        ),
-        Tool(
-            name="odoo_read_records",
-            description="""Read detailed information from Odoo records.
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of records to return",
+                    "default": 10
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Number of records to skip (for pagination)",
+                    "default": 0
+                },
+                "order": {
+                    "type": "string",
+                    "description": "Sort order (e.g., 'name asc', 'create_date desc')",
+                    "default": None
+                }
+            },
+            "required": ["model"]
+        }
+    ),
+    Tool(
+        name="odoo_read_records",
+        description="""Read detailed information from Odoo records.
 
 Use this after searching to get the actual data from records. You need the record IDs
 from a previous search operation.
@@ -113,31 +112,31 @@ Example usage:
 - Read product info: model='product.product', ids=[10], fields=['name','list_price','qty_available']
 
 Tip: Always specify fields to reduce data transfer and improve performance.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {
-                        "type": "string",
-                        "description": "Odoo model name"
-                    },
-                    "ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "List of record IDs to read"
-                    },
-                    "fields": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of field names to retrieve (omit for all fields)",
-                        "default": None
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {
+                    "type": "string",
+                    "description": "Odoo model name"
                 },
-                "required": ["model", "ids"]
-            }
-        ),
-        Tool(
-            name="odoo_search_read_records",
-            description="""Combined search and read operation - finds and retrieves records in one call.
+                "ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "List of record IDs to read"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of field names to retrieve (omit for all fields)",
+                    "default": None
+                }
+            },
+            "required": ["model", "ids"]
+        }
+    ),
+    Tool(
+        name="odoo_search_read_records",
+        description="""Combined search and read operation - finds and retrieves records in one call.
 
 This is more efficient than calling search + read separately. Use this when you want
 to find records AND get their data immediately.
@@ -166,46 +165,46 @@ Example usage:
   order='create_date desc'
 
 Best practice: Use this instead of separate search + read for better performance.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {
-                        "type": "string",
-                        "description": "Odoo model name"
-                    },
-                    "domain": {
-                        "type": "array",
-                        "description": "Search domain",
-                        "default": []
-                    },
-                    "fields": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Fields to retrieve",
-                        "default": None
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum records",
-                        "default": 10
-                    },
-                    "offset": {
-                        "type": "integer",
-                        "description": "Records to skip",
-                        "default": 0
-                    },
-                    "order": {
-                        "type": "string",
-                        "description": "Sort order",
-                        "default": None
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {
+                    "type": "string",
+                    "description": "Odoo model name"
+                },
+                "domain": {
+                    "type": "array",
+                    "description": "Search domain",
+                    "default": []
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Fields to retrieve",
+                    "default": None
                 },
-                "required": ["model"]
-            }
-        ),
-        Tool(
-            name="odoo_create_record",
-            description="""Create a new record in Odoo.
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum records",
+                    "default": 10
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Records to skip",
+                    "default": 0
+                },
+                "order": {
+                    "type": "string",
+                    "description": "Sort order",
+                    "default": None
+                }
+            },
+            "required": ["model"]
+        }
+    ),
+    Tool(
+        name="odoo_create_record",
+        description="""Create a new record in Odoo.
 
 Use this to create customers, products, sales orders, invoices, or any other Odoo record.
 
@@ -233,24 +232,24 @@ Example usage:
   values={'name': 'New Product', 'list_price': 99.99, 'type': 'consu'}
 
 Important: Use odoo_get_model_fields first to see available fields and their requirements.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {
-                        "type": "string",
-                        "description": "Odoo model name"
-                    },
-                    "values": {
-                        "type": "object",
-                        "description": "Dictionary of field values for the new record"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {
+                    "type": "string",
+                    "description": "Odoo model name"
                 },
-                "required": ["model", "values"]
-            }
-        ),
-        Tool(
-            name="odoo_update_record",
-            description="""Update existing records in Odoo.
+                "values": {
+                    "type": "object",
+                    "description": "Dictionary of field values for the new record"
+                }
+            },
+            "required": ["model", "values"]
+        }
+    ),
+    Tool(
+        name="odoo_update_record",
+        description="""Update existing records in Odoo.
 
 Modify one or more records by providing their IDs and the fields to update.
 
@@ -281,29 +280,29 @@ Example usage:
   values={'list_price': 129.99}
 
 Tip: Read the record first to see current values before updating.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {
-                        "type": "string",
-                        "description": "Odoo model name"
-                    },
-                    "ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "List of record IDs to update"
-                    },
-                    "values": {
-                        "type": "object",
-                        "description": "Dictionary of field values to update"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {
+                    "type": "string",
+                    "description": "Odoo model name"
+                },
+                "ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "List of record IDs to update"
                 },
-                "required": ["model", "ids", "values"]
-            }
-        ),
-        Tool(
-            name="odoo_delete_record",
-            description="""Delete records from Odoo (WARNING: This is permanent!).
+                "values": {
+                    "type": "object",
+                    "description": "Dictionary of field values to update"
+                }
+            },
+            "required": ["model", "ids", "values"]
+        }
+    ),
+    Tool(
+        name="odoo_delete_record",
+        description="""Delete records from Odoo (WARNING: This is permanent!).
 
 Use with caution - deleted records cannot be recovered.
 
@@ -329,25 +328,25 @@ Example usage:
   ids=[10, 11, 12]
 
 Best practice: Always confirm with the user before deleting records.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {
-                        "type": "string",
-                        "description": "Odoo model name"
-                    },
-                    "ids": {
-                        "type": "array",
-                        "items": {"type": "integer"},
-                        "description": "List of record IDs to delete"
-                    }
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {
+                    "type": "string",
+                    "description": "Odoo model name"
                 },
-                "required": ["model", "ids"]
-            }
-        ),
-        Tool(
-            name="odoo_get_model_fields",
-            description="""Get detailed information about fields in an Odoo model.
+                "ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "description": "List of record IDs to delete"
+                }
+            },
+            "required": ["model", "ids"]
+        }
+    ),
+    Tool(
+        name="odoo_get_model_fields",
+        description="""Get detailed information about fields in an Odoo model.
 
 Use this to discover what fields are available in a model, their types, and whether
 they're required. This is essential before creating or updating records.
@@ -381,18 +380,173 @@ Example usage:
 - Get invoice fields: model='account.move'
 
 Best practice: Always check fields before creating/updating to avoid errors.""",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "model": {
-                        "type": "string",
-                        "description": "Odoo model name to inspect"
-                    }
-                },
-                "required": ["model"]
-            }
-        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "model": {
+                    "type": "string",
+                    "description": "Odoo model name to inspect"
+                }
+            },
+            "required": ["model"]
+        }
+    ),
+)
+
+
+def get_tools() -> Tuple[Tool, ...]:
+    """
+    Get all available MCP tools with detailed, LLM-friendly descriptions.
+
+    Each tool includes:
+    - Clear, concise description
+    - Detailed parameter explanations
+    - Usage examples in descriptions
+    - Common error scenarios
+    """
+    return _TOOLS
+
+
+# The wire form never changes either; serialize it once so transports that
+# can send raw bytes skip the per-request model walk and JSON encode.
+_TOOLS_JSON_BYTES: bytes = orjson.dumps({
+    "tools": [
+        {
+            "name": tool.name,
+            "description": tool.description,
+            "inputSchema": tool.inputSchema
+        }
+        for tool in _TOOLS
     ]
+})
+
+
+def get_tools_json_bytes() -> bytes:
+    """Pre-serialized {"tools": [...]} payload for raw-bytes responses."""
+    return _TOOLS_JSON_BYTES
+
+
+async def _search_records(arguments: Dict[str, Any], odoo_client: OdooClient) -> Dict:
+    result = await odoo_client.search(
+        model=arguments["model"],
+        domain=arguments.get("domain", []),
+        limit=arguments.get("limit", 10),
+        offset=arguments.get("offset", 0),
+        order=arguments.get("order")
+    )
+    return {
+        "success": True,
+        "record_ids": result,
+        "count": len(result),
+        "message": f"Found {len(result)} record(s) in {arguments['model']}"
+    }
+
+
+async def _read_records(arguments: Dict[str, Any], odoo_client: OdooClient) -> Dict:
+    result = await odoo_client.read(
+        model=arguments["model"],
+        ids=arguments["ids"],
+        fields=arguments.get("fields")
+    )
+    return {
+        "success": True,
+        "records": result,
+        "count": len(result),
+        "message": f"Retrieved {len(result)} record(s) from {arguments['model']}"
+    }
+
+
+async def _search_read_records(arguments: Dict[str, Any], odoo_client: OdooClient) -> Dict:
+    result = await odoo_client.search_read(
+        model=arguments["model"],
+        domain=arguments.get("domain", []),
+        fields=arguments.get("fields"),
+        limit=arguments.get("limit", 10),
+        offset=arguments.get("offset", 0),
+        order=arguments.get("order")
+    )
+    return {
+        "success": True,
+        "records": result,
+        "count": len(result),
+        "message": f"Found and retrieved {len(result)} record(s) from {arguments['model']}"
+    }
+
+
+async def _create_record(arguments: Dict[str, Any], odoo_client: OdooClient) -> Dict:
+    record_id = await odoo_client.create(
+        model=arguments["model"],
+        values=arguments["values"]
+    )
+    return {
+        "success": True,
+        "record_id": record_id,
+        "message": f"Successfully created record in {arguments['model']} with ID {record_id}"
+    }
+
+
+async def _update_record(arguments: Dict[str, Any], odoo_client: OdooClient) -> Dict:
+    model = arguments["model"]
+    ids = arguments["ids"]
+    result = await odoo_client.write(model=model, ids=ids, values=arguments["values"])
+    count = len(ids)
+    return {
+        "success": True,
+        "updated": result,
+        "count": count,
+        "message": f"Successfully updated {count} record(s) in {model}"
+    }
+
+
+async def _delete_record(arguments: Dict[str, Any], odoo_client: OdooClient) -> Dict:
+    model = arguments["model"]
+    ids = arguments["ids"]
+    result = await odoo_client.unlink(model=model, ids=ids)
+    count = len(ids)
+    return {
+        "success": True,
+        "deleted": result,
+        "count": count,
+        "message": f"Successfully deleted {count} record(s) from {model}"
+    }
+
+
+async def _get_model_fields(arguments: Dict[str, Any], odoo_client: OdooClient) -> Dict:
+    result = await odoo_client.get_fields(model=arguments["model"])
+    return {
+        "success": True,
+        "fields": result,
+        "field_count": len(result),
+        "message": f"Retrieved {len(result)} field definitions for {arguments['model']}"
+    }
+
+
+# Static advice attached to every error payload; frozen so the hot error
+# path (LLMs probing wrong model names) allocates nothing for it.
+_ERROR_SUGGESTIONS = (
+    "Check that the model name is correct",
+    "Verify that field names match the model schema",
+    "Ensure you have proper permissions",
+    "Use odoo_get_model_fields to see available fields"
+)
+
+
+# Required argument names per tool, derived from the published schemas, so
+# malformed calls fail locally in microseconds instead of round-tripping to
+# Odoo and surfacing a server-side traceback.
+_REQUIRED = {tool.name: tuple(tool.inputSchema.get("required", ())) for tool in _TOOLS}
+
+
+# O(1) name -> handler dispatch; keep entries aligned with _TOOLS.
+_DISPATCH = {
+    "odoo_search_records": _search_records,
+    "odoo_read_records": _read_records,
+    "odoo_search_read_records": _search_read_records,
+    "odoo_create_record": _create_record,
+    "odoo_update_record": _update_record,
+    "odoo_delete_record": _delete_record,
+    "odoo_get_model_fields": _get_model_fields,
+}
 
 
 async def handle_tool_call(
@@ -411,108 +565,28 @@ async def handle_tool_call(
     Returns:
         List of TextContent responses
     """
-    logger.info("tool_call_started", tool=tool_name, arguments=arguments)
-    
+    # _LogRepr defers (and bounds) the arguments repr so a huge domain or
+    # values payload isn't stringified unless the event actually renders.
+    logger.info("tool_call_started", tool=tool_name, arguments=_LogRepr(arguments))
+
     try:
-        if tool_name == "odoo_search_records":
-            result = await odoo_client.search(
-                model=arguments["model"],
-                domain=arguments.get("domain", []),
-                limit=arguments.get("limit", 10),
-                offset=arguments.get("offset", 0),
-                order=arguments.get("order")
-            )
-            response = {
-                "success": True,
-                "record_ids": result,
-                "count": len(result),
-                "message": f"Found {len(result)} record(s) in {arguments['model']}"
-            }
-            
-        elif tool_name == "odoo_read_records":
-            result = await odoo_client.read(
-                model=arguments["model"],
-                ids=arguments["ids"],
-                fields=arguments.get("fields")
-            )
-            response = {
-                "success": True,
-                "records": result,
-                "count": len(result),
-                "message": f"Retrieved {len(result)} record(s) from {arguments['model']}"
-            }
-            
-        elif tool_name == "odoo_search_read_records":
-            result = await odoo_client.search_read(
-                model=arguments["model"],
-                domain=arguments.get("domain", []),
-                fields=arguments.get("fields"),
-                limit=arguments.get("limit", 10),
-                offset=arguments.get("offset", 0),
-                order=arguments.get("order")
-            )
-            response = {
-                "success": True,
-                "records": result,
-                "count": len(result),
-                "message": f"Found and retrieved {len(result)} record(s) from {arguments['model']}"
-            }
-            
-        elif tool_name == "odoo_create_record":
-            record_id = await odoo_client.create(
-                model=arguments["model"],
-                values=arguments["values"]
-            )
-            response = {
-                "success": True,
-                "record_id": record_id,
-                "message": f"Successfully created record in {arguments['model']} with ID {record_id}"
-            }
-            
-        elif tool_name == "odoo_update_record":
-            result = await odoo_client.write(
-                model=arguments["model"],
-                ids=arguments["ids"],
-                values=arguments["values"]
-            )
-            response = {
-                "success": True,
-                "updated": result,
-                "count": len(arguments["ids"]),
-                "message": f"Successfully updated {len(arguments['ids'])} record(s) in {arguments['model']}"
-            }
-            
-        elif tool_name == "odoo_delete_record":
-            result = await odoo_client.unlink(
-                model=arguments["model"],
-                ids=arguments["ids"]
-            )
-            response = {
-                "success": True,
-                "deleted": result,
-                "count": len(arguments["ids"]),
-                "message": f"Successfully deleted {len(arguments['ids'])} record(s) from {arguments['model']}"
-            }
-            
-        elif tool_name == "odoo_get_model_fields":
-            result = await odoo_client.get_fields(
-                model=arguments["model"]
-            )
-            response = {
-                "success": True,
-                "fields": result,
-                "field_count": len(result),
-                "message": f"Retrieved {len(result)} field definitions for {arguments['model']}"
-            }
-            
-        else:
+        handler = _DISPATCH.get(tool_name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {tool_name}")
-        
+
+        missing = [key for key in _REQUIRED[tool_name] if key not in arguments]
+        if missing:
+            raise ValueError(
+                f"Missing required argument(s) for {tool_name}: {', '.join(missing)}"
+            )
+
+        response = await handler(arguments, odoo_client)
+
         logger.info("tool_call_succeeded", tool=tool_name)
         
         return [TextContent(
             type="text",
-            text=json.dumps(response, indent=2, default=str)
+            text=orjson.dumps(response, default=str, option=_JSON_OPTS).decode()
         )]
         
     except Exception as e:
@@ -523,15 +597,10 @@ async def handle_tool_call(
             "error": str(e),
             "error_type": type(e).__name__,
             "message": f"Error executing {tool_name}: {str(e)}",
-            "suggestions": [
-                "Check that the model name is correct",
-                "Verify that field names match the model schema",
-                "Ensure you have proper permissions",
-                "Use odoo_get_model_fields to see available fields"
-            ]
+            "suggestions": _ERROR_SUGGESTIONS
         }
         
         return [TextContent(
             type="text",
-            text=json.dumps(error_response, indent=2)
+            text=orjson.dumps(error_response, option=_JSON_OPTS).decode()
         )]